@@ -0,0 +1,99 @@
+#!/bin/env python3
+
+import argparse
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+# Times the generation of a single large object type by each backend.
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(REPOSITORY))
+
+import dragoman
+
+FIELD_TYPES = [
+	"integer",
+	"string",
+	"boolean",
+	"float",
+	"(array string)",
+	"(array (array integer))",
+	"(set integer)",
+	"Flavor",
+	"(array Flavor)",
+]
+
+def load_backend (name: str):
+	return sys.modules[dragoman.Backend.get(name).__module__]
+
+def write_schema (path: Path, fields: int):
+	with open(path, 'w') as file:
+		file.write("(enum Flavor string\n")
+		file.write("\t(entry SWEET swe)\n")
+		file.write("\t(entry SOUR sou)\n")
+		file.write(")\n\n")
+		file.write("(object LargeObject\n")
+
+		for i in range(0, fields):
+			file.write(
+				"\t(entry field_"
+				+ str(i)
+				+ " f"
+				+ str(i)
+				+ " "
+				+ FIELD_TYPES[i % len(FIELD_TYPES)]
+				+ ")\n"
+			)
+
+		file.write(")\n")
+
+if __name__ == '__main__':
+	argparser = argparse.ArgumentParser()
+	argparser.add_argument(
+		"--fields",
+		type=int,
+		default=500,
+		help="Number of fields in the generated object"
+	)
+	argparser.add_argument(
+		"--runs",
+		type=int,
+		default=20,
+		help="Number of conversions per backend"
+	)
+	args = argparser.parse_args()
+
+	dragoman.Log.LEVEL = 0
+	dragoman.Dragoman.initialize()
+
+	with tempfile.TemporaryDirectory() as tmp:
+		schema = Path(tmp) / "LargeObject.dgl"
+		write_schema(schema, args.fields)
+		dragoman.ParseSession().parse_file(str(schema))
+		dragoman.Dragoman.OUTPUT_FOLDER = tmp
+
+		large_object = dragoman.ObjectType.get("largeobject")
+
+		for name in dragoman.Backend.get_names():
+			backend = load_backend(name)
+
+			# Unchanged output is not written again; only emission is timed.
+			start = time.perf_counter()
+
+			for i in range(0, args.runs):
+				backend.ObjectTypeConverter.convert(large_object)
+
+			elapsed = (time.perf_counter() - start) / args.runs
+
+			print(
+				name
+				+ ": "
+				+ "{:.2f}".format(elapsed * 1000)
+				+ " ms per "
+				+ str(args.fields)
+				+ "-field object."
+			)
@@ -0,0 +1,218 @@
+#!/bin/env python3
+
+import argparse
+
+from pathlib import Path
+
+# Writes a synthetic schema: "Root.dgl" requires every module, each module
+# requiring up to "fan_out" of the modules before it. Modules start with an
+# enum, followed by objects whose entries use primitives, that enum, objects
+# from required modules and containers of these nested "depth" times. The
+# first "polymorph_cases" objects of a module are the cases of a polymorph.
+
+PRIMITIVE_TYPES = [
+	"integer",
+	"string",
+	"boolean",
+	"float",
+]
+
+def get_module_name (module: int) -> str:
+	return "Module" + str(module)
+
+def get_object_name (module: int, index: int) -> str:
+	return "M" + str(module) + "O" + str(index)
+
+def get_container_type (referenced: str, depth: int) -> str:
+	# Dict values have to be objects, which are indexed by their "id" entry.
+	if (depth <= 0):
+		return referenced
+
+	result = "(dict id " + referenced + ")"
+
+	for i in range(1, depth):
+		result = "(array " + result + ")"
+
+	return result
+
+def get_field_type (
+	module: int,
+	index: int,
+	field: int,
+	requires: list[int],
+	objects: int,
+	depth: int
+) -> str:
+	kind = (index + field) % 7
+
+	if (kind < len(PRIMITIVE_TYPES)):
+		return PRIMITIVE_TYPES[kind]
+	elif (kind == 4):
+		return get_module_name(module) + "Kind"
+
+	# References go to required modules or to earlier objects of this one.
+	if (len(requires) > 0):
+		referenced = get_object_name(
+			requires[(index + field) % len(requires)],
+			(index * 7 + field) % objects
+		)
+	elif (index > 0):
+		referenced = get_object_name(module, (index + field) % index)
+	else:
+		return "(set integer)"
+
+	if (kind == 5):
+		return referenced
+	else:
+		return get_container_type(referenced, max(1, depth))
+
+def write_module (
+	path: Path,
+	module: int,
+	requires: list[int],
+	objects: int,
+	fields: int,
+	depth: int,
+	polymorph_cases: int
+):
+	module_name = get_module_name(module)
+	cases = min(polymorph_cases, objects)
+
+	with open(path, 'w') as file:
+		for r in requires:
+			file.write("(require " + get_module_name(r) + ")\n")
+
+		file.write("\n(enum " + module_name + "Kind string\n")
+
+		for i in range(0, max(2, cases)):
+			file.write("\t(entry CASE" + str(i) + " c" + str(i) + ")\n")
+
+		file.write(")\n\n")
+
+		for i in range(0, objects):
+			file.write("(object " + get_object_name(module, i) + "\n")
+			file.write("\t(entry id id string)\n")
+
+			if (i < cases):
+				file.write("\t(entry kind knd " + module_name + "Kind)\n")
+
+			for f in range(0, fields):
+				file.write(
+					"\t(entry field_"
+					+ str(f)
+					+ " f"
+					+ str(f)
+					+ " "
+					+ get_field_type(module, i, f, requires, objects, depth)
+					+ ")\n"
+				)
+
+			file.write(")\n\n")
+
+		if (cases > 0):
+			file.write("(polymorph " + module_name + "Variant kind\n")
+
+			for i in range(0, cases):
+				file.write(
+					"\t(case CASE"
+					+ str(i)
+					+ " "
+					+ get_object_name(module, i)
+					+ ")\n"
+				)
+
+			file.write(")\n")
+
+def write_schema (
+	folder: Path,
+	types: int = 1000,
+	modules: int = 10,
+	fields: int = 4,
+	depth: int = 2,
+	polymorph_cases: int = 3,
+	fan_out: int = 1
+) -> Path:
+	# Returns the entry point. Each module holds an enum, its objects and,
+	# if any, its polymorph, which all count towards "types".
+	modules = max(1, modules)
+	per_module = max(1, types // modules)
+	polymorphs = 1 if (polymorph_cases > 0) else 0
+	objects = max(1, per_module - 1 - polymorphs)
+
+	folder.mkdir(parents=True, exist_ok=True)
+
+	with open(folder / "Root.dgl", 'w') as root:
+		for m in range(0, modules):
+			root.write("(require " + get_module_name(m) + ")\n")
+
+			write_module(
+				folder / (get_module_name(m) + ".dgl"),
+				m,
+				list(range(max(0, m - fan_out), m)),
+				objects,
+				fields,
+				depth,
+				polymorph_cases
+			)
+
+	return folder / "Root.dgl"
+
+def add_arguments (argparser):
+	argparser.add_argument(
+		"--types",
+		type=int,
+		default=1000,
+		help="Number of types in the generated schema"
+	)
+	argparser.add_argument(
+		"--modules",
+		type=int,
+		default=10,
+		help="Number of files the types are split in"
+	)
+	argparser.add_argument(
+		"--fields",
+		type=int,
+		default=4,
+		help="Number of entries per object type, besides its id"
+	)
+	argparser.add_argument(
+		"--depth",
+		type=int,
+		default=2,
+		help="How many array and dict types are nested in container entries"
+	)
+	argparser.add_argument(
+		"--polymorph-cases",
+		type=int,
+		default=3,
+		help="Number of cases of the polymorph of each module (0 for none)"
+	)
+	argparser.add_argument(
+		"--fan-out",
+		type=int,
+		default=1,
+		help="Number of previous modules each module requires"
+	)
+
+def get_parameters (args) -> dict:
+	return {
+		"types": args.types,
+		"modules": args.modules,
+		"fields": args.fields,
+		"depth": args.depth,
+		"polymorph_cases": args.polymorph_cases,
+		"fan_out": args.fan_out,
+	}
+
+if __name__ == '__main__':
+	argparser = argparse.ArgumentParser()
+	argparser.add_argument(
+		"output_folder",
+		type=Path,
+		help="Where to write the schema"
+	)
+	add_arguments(argparser)
+	args = argparser.parse_args()
+
+	print(write_schema(args.output_folder, **get_parameters(args)))
@@ -0,0 +1,84 @@
+#!/bin/env python3
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+
+from pathlib import Path
+
+import generator
+
+# Measures the peak resident set size of parsing a synthetic schema, split in
+# modules that each require the previous one.
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+
+def parse (entry_point: Path):
+	sys.path.insert(0, str(REPOSITORY))
+
+	import dragoman
+
+	dragoman.Log.LEVEL = 0
+	dragoman.Dragoman.initialize()
+	dragoman.ParseSession([entry_point.parent]).parse_file(str(entry_point))
+
+	print(len(dragoman.UserDefinedType.COLLECTION))
+
+if __name__ == '__main__':
+	argparser = argparse.ArgumentParser()
+	argparser.add_argument(
+		"--types",
+		type=int,
+		default=10000,
+		help="Number of types in the generated schema"
+	)
+	argparser.add_argument(
+		"--modules",
+		type=int,
+		default=20,
+		help="Number of files the types are split in"
+	)
+	argparser.add_argument(
+		"--fields",
+		type=int,
+		default=4,
+		help="Number of entries per object type"
+	)
+	argparser.add_argument("--parse", type=Path, help=argparse.SUPPRESS)
+	args = argparser.parse_args()
+
+	if (args.parse is not None):
+		parse(args.parse)
+
+		sys.exit(0)
+
+	with tempfile.TemporaryDirectory() as tmp:
+		entry_point = generator.write_schema(
+			Path(tmp),
+			types=args.types,
+			modules=args.modules,
+			fields=args.fields,
+			depth=1,
+			polymorph_cases=0,
+			fan_out=1
+		)
+
+		output = subprocess.run(
+			[sys.executable, __file__, "--parse", str(entry_point)],
+			stdout=subprocess.PIPE,
+			check=True,
+			text=True
+		)
+
+		# ru_maxrss is in kibibytes on Linux.
+		peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+		print(
+			"Parsed "
+			+ output.stdout.strip()
+			+ " types, peak RSS: "
+			+ "{:.1f}".format(peak / 1024)
+			+ " MiB."
+		)
@@ -0,0 +1,107 @@
+#!/bin/env python3
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+# Times the parsing of a wide require graph: a root module requiring many
+# independent modules.
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(REPOSITORY))
+
+import dragoman
+import generator
+
+def parse (folder: Path, jobs: int):
+	dragoman.Log.LEVEL = 0
+	dragoman.Dragoman.initialize()
+	session = dragoman.ParseSession([folder])
+
+	start = time.perf_counter()
+	session.parse_module_graph(str(folder / "Root.dgl"), jobs)
+	print(time.perf_counter() - start)
+
+def time_runs (folder: Path, jobs: int, runs: int) -> list[float]:
+	result = []
+
+	for i in range(0, runs):
+		output = subprocess.run(
+			[
+				sys.executable,
+				__file__,
+				"--parse",
+				str(folder),
+				"--jobs",
+				str(jobs)
+			],
+			stdout=subprocess.PIPE,
+			check=True,
+			text=True
+		)
+		result.append(float(output.stdout.strip()))
+
+	return result
+
+if __name__ == '__main__':
+	argparser = argparse.ArgumentParser()
+	argparser.add_argument(
+		"--modules",
+		type=int,
+		default=64,
+		help="Number of independent modules"
+	)
+	argparser.add_argument(
+		"--objects",
+		type=int,
+		default=40,
+		help="Number of object types per module"
+	)
+	argparser.add_argument(
+		"--runs",
+		type=int,
+		default=5,
+		help="Number of runs per configuration"
+	)
+	argparser.add_argument(
+		"--jobs",
+		type=int,
+		default=4,
+		help="Number of worker processes"
+	)
+	argparser.add_argument("--parse", type=Path, help=argparse.SUPPRESS)
+	args = argparser.parse_args()
+
+	if (args.parse is not None):
+		parse(args.parse, args.jobs)
+
+		sys.exit(0)
+
+	with tempfile.TemporaryDirectory() as tmp:
+		generator.write_schema(
+			Path(tmp),
+			types=args.modules * (args.objects + 1),
+			modules=args.modules,
+			fields=3,
+			depth=2,
+			polymorph_cases=0,
+			fan_out=0
+		)
+
+		for jobs in [1, args.jobs]:
+			timings = time_runs(Path(tmp), jobs, args.runs)
+
+			print(
+				str(jobs)
+				+ " job(s): median "
+				+ "{:.1f}".format(statistics.median(timings) * 1000)
+				+ " ms over "
+				+ str(args.runs)
+				+ " runs."
+			)
@@ -0,0 +1,75 @@
+#!/bin/env python3
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+# Measures the cold-start time of a backend, with the parser tables being
+# rebuilt at every start (before) and with them being loaded from a file
+# (after).
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+
+def time_runs (command: list[str], environment: dict, runs: int) -> list[float]:
+	result = []
+
+	for i in range(0, runs):
+		start = time.perf_counter()
+		subprocess.run(
+			command,
+			env=environment,
+			stdout=subprocess.DEVNULL,
+			check=True
+		)
+		result.append(time.perf_counter() - start)
+
+	return result
+
+def print_result (label: str, timings: list[float]):
+	print(
+		label
+		+ ": median "
+		+ "{:.1f}".format(statistics.median(timings) * 1000)
+		+ " ms, min "
+		+ "{:.1f}".format(min(timings) * 1000)
+		+ " ms over "
+		+ str(len(timings))
+		+ " runs."
+	)
+
+if __name__ == '__main__':
+	argparser = argparse.ArgumentParser()
+	argparser.add_argument(
+		"--runs",
+		type=int,
+		default=20,
+		help="Number of runs per configuration"
+	)
+	argparser.add_argument(
+		"--backend",
+		type=str,
+		default="dragoman-erlang-jiffy.py",
+		help="Backend script to start"
+	)
+	args = argparser.parse_args()
+
+	command = [sys.executable, str(REPOSITORY / args.backend), "--help"]
+
+	with tempfile.TemporaryDirectory() as tmp:
+		before = dict(os.environ)
+		before["DRAGOMAN_PARSER_TABLES"] = ""
+
+		after = dict(before)
+		after["DRAGOMAN_PARSER_TABLES"] = str(Path(tmp) / "dragoman.lrtables")
+
+		# Generates the tables file.
+		time_runs(command, after, 1)
+
+		print_result("Rebuilding tables", time_runs(command, before, args.runs))
+		print_result("Prebuilt tables", time_runs(command, after, args.runs))
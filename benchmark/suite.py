@@ -0,0 +1,213 @@
+#!/bin/env python3
+
+import argparse
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+import generator
+
+# Times the compilation of a synthetic schema: parsing (type names are
+# resolved as they are parsed) and the emission of each backend. Every run is
+# a separate process, so that its peak resident set size is its own. Results
+# are written as JSON and can be compared with those of a previous commit.
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+
+def get_peak_memory () -> float:
+	# ru_maxrss is in kibibytes on Linux.
+	return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_once (entry_point: Path, output_folder: Path, backends: list[str]):
+	sys.path.insert(0, str(REPOSITORY))
+
+	import dragoman
+
+	dragoman.Log.LEVEL = 0
+
+	session = dragoman.Session([entry_point.parent], output_folder, force=True)
+	targets = list()
+
+	for name in backends:
+		backend = dragoman.Backend.get(name)
+		dragoman.Session.add_state(backend.get_session_state())
+		targets.append((name, backend))
+
+	session.reset()
+	result = dict()
+
+	with session:
+		start = time.perf_counter()
+		dragoman.Dragoman.PARSE_SESSION.parse_module_graph(str(entry_point), 1)
+		result["parse"] = time.perf_counter() - start
+		result["parse peak memory"] = get_peak_memory()
+
+		for (name, backend) in targets:
+			backend.handle_arguments(session.get_target_arguments(backend))
+
+			start = time.perf_counter()
+			dragoman.Dragoman.run_target(
+				(name, backend, output_folder / name, backend.DEFAULT_INDENT)
+			)
+			result["emit " + name] = time.perf_counter() - start
+
+		result["types"] = len(dragoman.UserDefinedType.COLLECTION)
+		result["errors"] = dragoman.Log.ERRORS
+
+	result["peak memory"] = get_peak_memory()
+
+	print(json.dumps(result))
+
+def get_commit () -> str | None:
+	try:
+		output = subprocess.run(
+			["git", "rev-parse", "--short", "HEAD"],
+			cwd=REPOSITORY,
+			stdout=subprocess.PIPE,
+			stderr=subprocess.DEVNULL,
+			check=True,
+			text=True
+		)
+	except Exception:
+		return None
+
+	return output.stdout.strip()
+
+def run_suite (parameters: dict, backends: list[str], runs: int) -> dict:
+	samples = list()
+
+	with tempfile.TemporaryDirectory() as tmp:
+		entry_point = generator.write_schema(Path(tmp) / "schema", **parameters)
+
+		for i in range(0, runs):
+			output = subprocess.run(
+				[
+					sys.executable,
+					__file__,
+					"--run",
+					str(entry_point),
+					str(Path(tmp) / "output")
+				]
+				+ ["--backends"]
+				+ backends,
+				stdout=subprocess.PIPE,
+				check=True,
+				text=True
+			)
+			samples.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+	if (samples[0]["errors"] > 0):
+		raise Exception("The generated schema did not compile.")
+
+	types = samples[0]["types"]
+	phases = dict()
+
+	for phase in ["parse"] + ["emit " + name for name in backends]:
+		timings = [s[phase] for s in samples]
+		median = statistics.median(timings)
+
+		phases[phase] = {
+			"median (s)": median,
+			"min (s)": min(timings),
+			"types per second": types / median if (median > 0) else None,
+		}
+
+	return {
+		"commit": get_commit(),
+		"python": platform.python_version(),
+		"parameters": parameters,
+		"runs": runs,
+		"types": types,
+		"phases": phases,
+		"parse peak memory (MiB)": max(s["parse peak memory"] for s in samples),
+		"peak memory (MiB)": max(s["peak memory"] for s in samples),
+	}
+
+def format_change (value: float, previous: float | None) -> str:
+	if (previous is None) or (previous == 0):
+		return ""
+
+	return " (" + "{:+.1f}".format((value / previous - 1) * 100) + "%)"
+
+def print_results (results: dict, previous: dict | None):
+	previous_phases = dict()
+	previous_memory = None
+
+	if (previous is not None):
+		previous_phases = previous["phases"]
+		previous_memory = previous["peak memory (MiB)"]
+		print("Compared to " + str(previous["commit"]) + ":")
+
+	for (phase, values) in results["phases"].items():
+		median = values["median (s)"]
+		before = previous_phases.get(phase, dict()).get("median (s)")
+
+		print(
+			phase.ljust(24)
+			+ "{:10.1f}".format(median * 1000)
+			+ " ms "
+			+ "{:12.0f}".format(values["types per second"] or 0)
+			+ " types/s"
+			+ format_change(median, before)
+		)
+
+	print(
+		"peak memory".ljust(24)
+		+ "{:10.1f}".format(results["peak memory (MiB)"])
+		+ " MiB"
+		+ format_change(results["peak memory (MiB)"], previous_memory)
+	)
+
+if __name__ == '__main__':
+	argparser = argparse.ArgumentParser()
+	generator.add_arguments(argparser)
+	argparser.add_argument(
+		"--backends",
+		type=str,
+		nargs='+',
+		default=["erlang-jiffy", "gren"],
+		help="Backends whose emission is timed"
+	)
+	argparser.add_argument(
+		"--runs",
+		type=int,
+		default=5,
+		help="Number of runs, each in a new process"
+	)
+	argparser.add_argument(
+		"--output",
+		type=Path,
+		help="Where to write the results, as JSON"
+	)
+	argparser.add_argument(
+		"--compare",
+		type=Path,
+		help="Results of a previous run to compare against"
+	)
+	argparser.add_argument("--run", type=Path, nargs=2, help=argparse.SUPPRESS)
+	args = argparser.parse_args()
+
+	if (args.run is not None):
+		run_once(args.run[0], args.run[1], args.backends)
+
+		sys.exit(0)
+
+	results = run_suite(generator.get_parameters(args), args.backends, args.runs)
+	previous = None
+
+	if (args.compare is not None):
+		with open(args.compare, 'r') as file:
+			previous = json.load(file)
+
+	print_results(results, previous)
+
+	if (args.output is not None):
+		with open(args.output, 'w') as file:
+			json.dump(results, file, indent=1)
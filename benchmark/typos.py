@@ -0,0 +1,110 @@
+#!/bin/env python3
+
+import argparse
+import random
+import sys
+import time
+
+from pathlib import Path
+
+# Times the search for typo fix candidates among many type names, scanning the
+# list of names (before) and using a TypoIndex (after). Both have to find the
+# same candidates.
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(REPOSITORY))
+
+import dragoman
+
+def generate_names (count: int) -> list[str]:
+	result = dict()
+
+	while (len(result) < count):
+		name = "".join(
+			random.choice("abcdefghijklmnopqrstuvwxyz_")
+			for i in range(0, random.randint(6, 24))
+		)
+		result[name] = True
+
+	return list(result.keys())
+
+def scan_closest_to (target: str, candidates: list[str], percent) -> list[str]:
+	# Reference implementation, comparing the target with every candidate.
+	max_distance = max(len(target) * percent, 3)
+	deconstructed_target = dragoman.TypoFixer.deconstruct(target)
+	result = list()
+
+	for i in range(0, len(candidates)):
+		c = candidates[i]
+
+		if (abs(len(c) - len(target)) <= max_distance):
+			c_score = dragoman.TypoFixer.compare_deconstructed(
+				deconstructed_target,
+				dragoman.TypoFixer.deconstruct(c)
+			)
+
+			if (c_score <= max_distance):
+				result.append((c_score, i, c))
+
+	result.sort()
+
+	return [c for (c_score, i, c) in result]
+
+def add_typo (name: str) -> str:
+	chars = list(name)
+	chars[random.randrange(len(chars))] = random.choice("abcdefghijklmnopqrstuvwxyz")
+
+	return "".join(chars)
+
+if __name__ == '__main__':
+	argparser = argparse.ArgumentParser()
+	argparser.add_argument(
+		"--names",
+		type=int,
+		default=10000,
+		help="Number of known type names"
+	)
+	argparser.add_argument(
+		"--queries",
+		type=int,
+		default=1000,
+		help="Number of unknown names to find candidates for"
+	)
+	args = argparser.parse_args()
+
+	random.seed(0)
+	names = generate_names(args.names)
+	queries = [add_typo(random.choice(names)) for i in range(0, args.queries)]
+
+	start = time.perf_counter()
+	expected = [scan_closest_to(q, names, 0.25) for q in queries]
+	list_time = time.perf_counter() - start
+
+	start = time.perf_counter()
+	index = dragoman.TypoIndex(names)
+	build_time = time.perf_counter() - start
+
+	start = time.perf_counter()
+	found = [index.find_closest_to(q, 0.25) for q in queries]
+	index_time = time.perf_counter() - start
+
+	if (found != expected):
+		raise Exception("TypoIndex did not find the same candidates.")
+
+	print(
+		"List scan: "
+		+ "{:.1f}".format(list_time * 1000)
+		+ " ms for "
+		+ str(args.queries)
+		+ " queries."
+	)
+	print(
+		"TypoIndex: "
+		+ "{:.1f}".format(index_time * 1000)
+		+ " ms for "
+		+ str(args.queries)
+		+ " queries, built in "
+		+ "{:.1f}".format(build_time * 1000)
+		+ " ms."
+	)
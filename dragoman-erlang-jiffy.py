@@ -23,6 +23,9 @@ class NameConverter:
 
 		return result
 
+	def type_to_filename (t: dragoman.DefinedType) -> str:
+		return NameConverter.type_to_module_name(t) + ".erl"
+
 	def type_to_record_name (t: dragoman.DefinedType) -> str:
 		result = NameConverter.RECORD_NAMES.get(t)
 
@@ -653,12 +656,18 @@ class ObjectTypeConverter:
 						NameConverter.type_to_module_name(leaf_type.get_parent())
 					)
 					cw.append(":json_import(X), maps:put(")
-					cw.append(
-						NameConverter.type_to_module_name(leaf_type.get_parent())
-					)
-					cw.append(":get_")
-					cw.append(leaf_type.get_key_field_name())
-					cw.append("(E), E, Map) end, maps:new(), Y) end, ")
+					access = "E"
+					for (access_name, access_type) in leaf_type.get_accesses():
+						access = (
+							NameConverter.type_to_module_name(access_type)
+							+ ":get_"
+							+ access_name
+							+ "("
+							+ access
+							+ ")"
+						)
+					cw.append(access)
+					cw.append(", E, Map) end, maps:new(), Y) end, ")
 					cw.append(value_access)
 					cw.append(")")
 				elif (isinstance(leaf_type, dragoman.UserDefinedType)):
@@ -719,7 +728,7 @@ class ObjectTypeConverter:
 	def convert (e: dragoman.ObjectType):
 		code_writer = dragoman.CodeWriter(
 			Path(dragoman.Dragoman.OUTPUT_FOLDER)
-			/ (NameConverter.type_to_module_name(e) + ".erl")
+			/ NameConverter.type_to_filename(e)
 		)
 
 		code_writer.start_line("-module(")
@@ -904,7 +913,7 @@ class EnumTypeConverter:
 	def convert (e: dragoman.EnumType):
 		code_writer = dragoman.CodeWriter(
 			Path(dragoman.Dragoman.OUTPUT_FOLDER)
-			/ (NameConverter.type_to_module_name(e) + ".erl")
+			/ NameConverter.type_to_filename(e)
 		)
 
 		code_writer.start_line("-module(")
@@ -1114,7 +1123,7 @@ class PolymorphTypeConverter:
 	def convert (e: dragoman.PolymorphType):
 		code_writer = dragoman.CodeWriter(
 			Path(dragoman.Dragoman.OUTPUT_FOLDER)
-			/ (NameConverter.type_to_module_name(e) + ".erl")
+			/ NameConverter.type_to_filename(e)
 		)
 
 		code_writer.start_line("-module(")
@@ -1132,11 +1141,22 @@ class PolymorphTypeConverter:
 
 		code_writer.finalize()
 
-class Dragoman2Erlang:
+class Dragoman2Erlang (dragoman.Backend):
+	NAME = "erlang-jiffy"
+	DEFAULT_INDENT = "\t"
 	ENABLE_ATAXIA = False
 
-	def initialize ():
-		argparser = dragoman.Dragoman.initialize()
+	def get_session_state () -> list:
+		return [
+			(NameConverter, "MODULE_NAMES", dict),
+			(NameConverter, "RECORD_NAMES", dict),
+			(NameConverter, "VARIABLE_NAMES", dict),
+			(NameConverter, "RECORD_MEMBER_NAMES", dict),
+			(NameConverter, "ATOM_NAMES", dict),
+			(Dragoman2Erlang, "ENABLE_ATAXIA", lambda: False),
+		]
+
+	def add_arguments (argparser):
 		argparser.add_argument(
 			"--ataxia",
 			action="store_true",
@@ -1144,24 +1164,52 @@ class Dragoman2Erlang:
 			help="Enable Ataxia functions"
 		)
 
-		args = argparser.parse_args()
-
+	def handle_arguments (args):
 		if args.ataxia:
 			Dragoman2Erlang.ENABLE_ATAXIA = True
 
-		dragoman.Dragoman.handle_arguments(args)
-		dragoman.DragomanParser.parse_file(str(args.dgl_file[0]))
+	def get_caches () -> list:
+		return [
+			(NameConverter, "MODULE_NAMES"),
+			(NameConverter, "RECORD_NAMES"),
+			(NameConverter, "VARIABLE_NAMES"),
+			(NameConverter, "RECORD_MEMBER_NAMES"),
+			(NameConverter, "ATOM_NAMES"),
+		]
+
+	def get_filename (t: dragoman.UserDefinedType) -> str:
+		return NameConverter.type_to_filename(t)
 
 	def export ():
+		dragoman.Profiler.instrument(NameConverter, "erlang-jiffy name conversion")
+
+		manifest = dragoman.OutputManifest(
+			dragoman.Dragoman.OUTPUT_FOLDER,
+			Dragoman2Erlang.NAME,
+			dragoman.OutputManifest.compute_version(__file__),
+			{
+				"indentation": dragoman.CodeWriter.DEFAULT_INDENT,
+				"ataxia": Dragoman2Erlang.ENABLE_ATAXIA
+			}
+		)
+
+		conversions = list()
+
 		for e in dragoman.EnumType.get_all():
-			EnumTypeConverter.convert(e)
+			if (manifest.needs_update(e, NameConverter.type_to_filename(e))):
+				conversions.append((EnumTypeConverter.convert, e))
 
 		for e in dragoman.ObjectType.get_all():
-			ObjectTypeConverter.convert(e)
+			if (manifest.needs_update(e, NameConverter.type_to_filename(e))):
+				conversions.append((ObjectTypeConverter.convert, e))
 
 		for e in dragoman.PolymorphType.get_all():
-			PolymorphTypeConverter.convert(e)
+			if (manifest.needs_update(e, NameConverter.type_to_filename(e))):
+				conversions.append((PolymorphTypeConverter.convert, e))
+
+		dragoman.Dragoman.run_conversions(conversions)
+
+		manifest.finalize()
 
 if __name__ == '__main__':
-	Dragoman2Erlang.initialize()
-	Dragoman2Erlang.export()
+	dragoman.Backend.main(Dragoman2Erlang)
@@ -562,7 +562,7 @@ class ObjectTypeConverter:
 
 		code_writer.title_line("-", " Project ", 2, 80)
 
-		for d in e.get_dependencies():
+		for d in sorted(e.get_dependencies(), key = lambda d: d.get_name()):
 			code_writer.start_line("import ")
 			code_writer.append(NameConverter.type_to_module_name(d))
 			code_writer.newline()
@@ -947,7 +947,7 @@ class PolymorphTypeConverter:
 
 		code_writer.title_line("-", " Project ", 2, 80)
 
-		for d in e.get_dependencies():
+		for d in sorted(e.get_dependencies(), key = lambda d: d.get_name()):
 			code_writer.start_line("import ")
 			code_writer.append(NameConverter.type_to_module_name(d))
 			code_writer.newline()
@@ -973,26 +973,58 @@ class PolymorphTypeConverter:
 
 		code_writer.finalize()
 
-class Dragoman2Gren:
-	def initialize ():
-		dragoman.CodeWriter.DEFAULT_INDENT = "   "
+class Dragoman2Gren (dragoman.Backend):
+	NAME = "gren"
+	DEFAULT_INDENT = "   "
+
+	def get_session_state () -> list:
+		return [
+			(NameConverter, "MODULE_NAMES", dict),
+			(NameConverter, "RECORD_NAMES", dict),
+			(NameConverter, "VARIABLE_NAMES", dict),
+			(NameConverter, "RECORD_MEMBER_NAMES", dict),
+			(NameConverter, "ATOM_NAMES", dict),
+		]
+
+	def get_caches () -> list:
+		return [
+			(NameConverter, "MODULE_NAMES"),
+			(NameConverter, "RECORD_NAMES"),
+			(NameConverter, "VARIABLE_NAMES"),
+			(NameConverter, "RECORD_MEMBER_NAMES"),
+			(NameConverter, "ATOM_NAMES"),
+		]
+
+	def get_filename (t: dragoman.UserDefinedType) -> str:
+		return NameConverter.type_to_filename(t)
 
-		argparser = dragoman.Dragoman.initialize()
-		args = argparser.parse_args()
+	def export ():
+		dragoman.Profiler.instrument(NameConverter, "gren name conversion")
 
-		dragoman.Dragoman.handle_arguments(args)
-		dragoman.DragomanParser.parse_file(str(args.dgl_file[0]))
+		manifest = dragoman.OutputManifest(
+			dragoman.Dragoman.OUTPUT_FOLDER,
+			Dragoman2Gren.NAME,
+			dragoman.OutputManifest.compute_version(__file__),
+			{"indentation": dragoman.CodeWriter.DEFAULT_INDENT}
+		)
+
+		conversions = list()
 
-	def export ():
 		for e in dragoman.EnumType.get_all():
-			EnumTypeConverter.convert(e)
+			if (manifest.needs_update(e, NameConverter.type_to_filename(e))):
+				conversions.append((EnumTypeConverter.convert, e))
 
 		for e in dragoman.ObjectType.get_all():
-			ObjectTypeConverter.convert(e)
+			if (manifest.needs_update(e, NameConverter.type_to_filename(e))):
+				conversions.append((ObjectTypeConverter.convert, e))
 
 		for e in dragoman.PolymorphType.get_all():
-			PolymorphTypeConverter.convert(e)
+			if (manifest.needs_update(e, NameConverter.type_to_filename(e))):
+				conversions.append((PolymorphTypeConverter.convert, e))
+
+		dragoman.Dragoman.run_conversions(conversions)
+
+		manifest.finalize()
 
 if __name__ == '__main__':
-	Dragoman2Gren.initialize()
-	Dragoman2Gren.export()
+	dragoman.Backend.main(Dragoman2Gren)
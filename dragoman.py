@@ -2,9 +2,27 @@
 
 from sly import Lexer, Parser
 
+import sly
+
 import sys
+import abc
 import argparse
+import atexit
+import bisect
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import pickle
 import re
+import shutil
+import threading
+import time
+import tracemalloc
 
 from pathlib import Path
 
@@ -14,20 +32,124 @@ from pathlib import Path
 class Log:
 	ERRORS = 0
 	WARNINGS = 0
+	DIAGNOSTICS = list()
+	# 0 only shows errors, 1 adds warnings and progress, 2 adds debug messages.
+	LEVEL = 1
+	FORMAT = "text"
+	FORMATS = ["text", "json"]
+	# Output is kept until there is enough of it, see flush().
+	BUFFER = list()
+	BUFFER_SIZE = 0
+	BUFFER_LIMIT = 1 << 16
+	HAS_SUMMARY = False
+
+	def write (file, text: str):
+		Log.BUFFER.append((file, text))
+		Log.BUFFER_SIZE += len(text)
+
+		if (Log.BUFFER_SIZE >= Log.BUFFER_LIMIT):
+			Log.flush()
+
+	def flush ():
+		# Needs to be called before forking, or children write it again.
+		buffer = Log.BUFFER
+		Log.BUFFER = list()
+		Log.BUFFER_SIZE = 0
+		index = 0
+
+		while (index < len(buffer)):
+			file = buffer[index][0]
+			end = index
+
+			while ((end < len(buffer)) and (buffer[end][0] is file)):
+				end += 1
+
+			file.write("".join(text for (f, text) in buffer[index:end]))
+			file.flush()
+			index = end
+
+	def to_text (args: tuple, kwargs: dict) -> str:
+		return (
+			kwargs.get("sep", " ").join(str(a) for a in args)
+			+ kwargs.get("end", "\n")
+		)
+
+	def add_diagnostic (
+		severity: str,
+		args: tuple,
+		diagnostic: tuple | None
+	) -> dict:
+		# "diagnostic" is (code, message, filename, line, column), for messages
+		# that are about a location. Others are recorded as printed.
+		if (diagnostic is None):
+			diagnostic = (None, " ".join(str(a) for a in args), None, None, None)
+
+		(code, message, filename, line, column) = diagnostic
+		result = {
+			"severity": severity,
+			"code": code,
+			"message": message,
+			"file": filename,
+			"line": line,
+			"column": column,
+		}
+
+		Log.DIAGNOSTICS.append(result)
+
+		return result
+
+	def print_diagnostic (
+		severity: str,
+		args: tuple,
+		kwargs: dict,
+		diagnostic: tuple | None
+	):
+		entry = Log.add_diagnostic(severity, args, diagnostic)
 
-	def print_error (*args, **kwargs):
-		print(*args, file=sys.stderr, **kwargs)
+		if ((severity == "warning") and (Log.LEVEL < 1)):
+			return
+
+		if (Log.FORMAT == "json"):
+			Log.write(sys.stderr, json.dumps(entry) + "\n")
+		else:
+			Log.write(sys.stderr, Log.to_text(args, kwargs))
+
+	def print_error (*args, diagnostic = None, **kwargs):
 		Log.ERRORS += 1
+		Log.print_diagnostic("error", args, kwargs, diagnostic)
 
-	def print_warning (*args, **kwargs):
-		print(*args, file=sys.stderr, **kwargs)
+	def print_warning (*args, diagnostic = None, **kwargs):
 		Log.WARNINGS += 1
+		Log.print_diagnostic("warning", args, kwargs, diagnostic)
+
+	def write_diagnostics (path: Path):
+		with open(path, 'w') as file:
+			json.dump(
+				{
+					"errors": Log.ERRORS,
+					"warnings": Log.WARNINGS,
+					"diagnostics": Log.DIAGNOSTICS,
+				},
+				file,
+				indent=1
+			)
+
+	def print_failure (*args, **kwargs):
+		# Conclusions about errors already reported, so not counted as one.
+		if (Log.FORMAT == "text"):
+			Log.write(sys.stderr, Log.to_text(args, kwargs))
+
+	def print_result (*args, **kwargs):
+		# What was asked for, such as a query's answer, printed at any level.
+		Log.write(sys.stdout, Log.to_text(args, kwargs))
 
 	def print(*args, **kwargs):
-		print(*args, **kwargs)
+		if (Log.LEVEL >= 1):
+			Log.write(sys.stdout, Log.to_text(args, kwargs))
 
 	def print_debug (*args, **kwargs):
-		print(*args, **kwargs)
+		if (Log.LEVEL >= 2):
+			Log.write(sys.stdout, Log.to_text(args, kwargs))
 
 	def print_summary ():
 		Log.print(
@@ -38,11 +160,323 @@ class Log:
 			+ " warning(s)."
 		)
 
+	def finalize ():
+		# Registered to run at exit by command line tools.
+		if (not Log.HAS_SUMMARY):
+			Log.HAS_SUMMARY = True
+			Log.print_summary()
+
+		Log.flush()
+
+################################################################################
+#### PROFILING #################################################################
+################################################################################
+class ProfilerPhase:
+	def __init__ (this, category: str, name: str, args: dict | None):
+		this.category = category
+		this.name = name
+		this.args = args
+
+	def __enter__ (this):
+		this.allocated = tracemalloc.get_traced_memory()[0]
+		this.start = time.perf_counter()
+
+		return this
+
+	def __exit__ (this, exception_type, exception, traceback):
+		duration = time.perf_counter() - this.start
+
+		Profiler.EVENTS.append(
+			(
+				this.category,
+				this.name,
+				this.start,
+				duration,
+				tracemalloc.get_traced_memory()[0] - this.allocated,
+				os.getpid(),
+				this.args
+			)
+		)
+
+		return False
+
+class Profiler:
+	ENABLED = False
+	TRACE_FILE = None
+	EVENTS = list()
+	# Functions called too often to be traced one by one: [calls, seconds].
+	TOTALS = dict()
+	NO_PHASE = contextlib.nullcontext()
+
+	def enable (trace_file: Path | None):
+		Profiler.ENABLED = True
+		Profiler.TRACE_FILE = trace_file
+
+		if (not tracemalloc.is_tracing()):
+			tracemalloc.start()
+
+	def phase (category: str, name: str, args: dict | None = None):
+		if (not Profiler.ENABLED):
+			return Profiler.NO_PHASE
+
+		return ProfilerPhase(category, name, args)
+
+	def timed_action (category: str):
+		# For grammar actions, attributed to the file being parsed.
+		def decorate (function):
+			@functools.wraps(function)
+			def action (this, t):
+				if (not Profiler.ENABLED):
+					return function(this, t)
+
+				with ProfilerPhase(category, this.context.get_filename(), None):
+					return function(this, t)
+
+			return action
+
+		return decorate
+
+	def instrument (owner, category: str):
+		if ((not Profiler.ENABLED) or (category in Profiler.TOTALS)):
+			return
+
+		totals = [0, 0.0]
+		Profiler.TOTALS[category] = totals
+
+		def wrap (function):
+			def wrapper (*args, **kwargs):
+				start = time.perf_counter()
+
+				try:
+					return function(*args, **kwargs)
+				finally:
+					totals[0] += 1
+					totals[1] += time.perf_counter() - start
+
+			return wrapper
+
+		for (name, value) in list(vars(owner).items()):
+			if (callable(value) and not name.startswith("__")):
+				setattr(owner, name, wrap(value))
+
+	def time_iterator (iterable, category: str):
+		totals = Profiler.TOTALS.setdefault(category, [0, 0.0])
+		iterator = iter(iterable)
+
+		while True:
+			start = time.perf_counter()
+
+			try:
+				value = next(iterator)
+			except StopIteration:
+				return
+			finally:
+				totals[0] += 1
+				totals[1] += time.perf_counter() - start
+
+			yield value
+
+	def snapshot () -> (int, dict):
+		return (
+			len(Profiler.EVENTS),
+			dict((k, list(v)) for (k, v) in Profiler.TOTALS.items())
+		)
+
+	def get_changes (snapshot: (int, dict)) -> (list, dict):
+		# Lets processes forked from this one report what they measured.
+		(event_count, totals) = snapshot
+		result = dict()
+
+		for (category, (count, duration)) in Profiler.TOTALS.items():
+			(previous_count, previous_duration) = totals.get(category, (0, 0.0))
+			result[category] = (count - previous_count, duration - previous_duration)
+
+		return (Profiler.EVENTS[event_count:], result)
+
+	def merge_changes (changes: (list, dict)):
+		(events, totals) = changes
+		Profiler.EVENTS.extend(events)
+
+		for (category, (count, duration)) in totals.items():
+			entry = Profiler.TOTALS.setdefault(category, [0, 0.0])
+			entry[0] += count
+			entry[1] += duration
+
+	def print_summary ():
+		if (not Profiler.ENABLED):
+			return
+
+		categories = dict()
+
+		for (category, name, start, duration, allocated, pid, args) in Profiler.EVENTS:
+			entry = categories.setdefault(category, [0, 0.0, 0])
+			entry[0] += 1
+			entry[1] += duration
+			entry[2] += allocated
+
+		Log.print_result(
+			"{:<24} {:>8} {:>12} {:>14}".format(
+				"Phase",
+				"Count",
+				"Time (ms)",
+				"Allocated (KiB)"
+			)
+		)
+
+		for (category, (count, duration, allocated)) in categories.items():
+			Log.print_result(
+				"{:<24} {:>8} {:>12.1f} {:>14.1f}".format(
+					category,
+					count,
+					duration * 1000,
+					allocated / 1024
+				)
+			)
+
+		for (category, (count, duration)) in Profiler.TOTALS.items():
+			Log.print_result(
+				"{:<24} {:>8} {:>12.1f} {:>14}".format(
+					category,
+					count,
+					duration * 1000,
+					"-"
+				)
+			)
+
+		Log.print_result("\nSlowest:")
+
+		for event in sorted(Profiler.EVENTS, key = lambda e: -e[3])[:10]:
+			Log.print_result(
+				"{:>10.1f} ms  {} {}".format(event[3] * 1000, event[0], event[1])
+			)
+
+	def write_trace ():
+		if (Profiler.TRACE_FILE is None):
+			return
+
+		events = list()
+
+		for (category, name, start, duration, allocated, pid, args) in Profiler.EVENTS:
+			event_args = {"allocated": allocated}
+			event_args.update(args or dict())
+			events.append(
+				{
+					"name": name,
+					"cat": category,
+					"ph": "X",
+					"ts": start * 1000000,
+					"dur": duration * 1000000,
+					"pid": pid,
+					"tid": 0,
+					"args": event_args
+				}
+			)
+
+		with open(Profiler.TRACE_FILE, 'w') as file:
+			json.dump({"traceEvents": events}, file)
+
+	def finalize ():
+		Profiler.print_summary()
+		Profiler.write_trace()
+
 ################################################################################
 #### IN-PLACE TYPO FIXING ######################################################
 ################################################################################
+class TypoIndex:
+	# Names are grouped by length, as TypoFixer's character count distance is
+	# at least their difference in length. Each name also has a signature,
+	# with one bit per character and count up to SIGNATURE_COUNTS: two names
+	# differ by no more bits than their distance, and by exactly as many when
+	# no character is repeated more often, so most names are ruled out or
+	# scored by comparing their signatures.
+	SIGNATURE_COUNTS = 3
+
+	def __init__ (this, candidates: list[str] = []):
+		this.lengths = dict()
+		this.orders = dict()
+		this.next_order = 0
+		this.character_shifts = dict()
+
+		for c in candidates:
+			this.add(c)
+
+	def get_signature (this, name: str) -> (int, bool):
+		result = 0
+		is_exact = True
+
+		for (char, count) in TypoFixer.deconstruct(name).items():
+			shift = this.character_shifts.get(char)
+
+			if (shift is None):
+				shift = len(this.character_shifts) * TypoIndex.SIGNATURE_COUNTS
+				this.character_shifts[char] = shift
+
+			if (count > TypoIndex.SIGNATURE_COUNTS):
+				count = TypoIndex.SIGNATURE_COUNTS
+				is_exact = False
+
+			result |= ((1 << count) - 1) << shift
+
+		return (result, is_exact)
+
+	def add (this, name: str):
+		# Ties are ranked by insertion order, as with a list of candidates.
+		this.orders[name] = this.next_order
+		this.next_order += 1
+
+		this.lengths.setdefault(len(name), dict())[name] = this.get_signature(
+			name
+		)
+
+	def remove (this, name: str):
+		if (this.orders.pop(name, None) is None):
+			return
+
+		names = this.lengths[len(name)]
+		del names[name]
+
+		if (len(names) == 0):
+			del this.lengths[len(name)]
+
+	def find_closest_to (this, target: str, percent) -> list[str]:
+		max_distance = max(len(target) * percent, 3)
+		(target_signature, is_target_exact) = this.get_signature(target)
+		deconstructed_target = TypoFixer.deconstruct(target)
+		result = list()
+
+		for (length, names) in this.lengths.items():
+			if (abs(length - len(target)) > max_distance):
+				continue
+
+			for (name, (signature, is_exact)) in names.items():
+				distance = (signature ^ target_signature).bit_count()
+
+				if (distance > max_distance):
+					continue
+
+				if (not (is_exact and is_target_exact)):
+					distance = TypoFixer.compare_deconstructed(
+						deconstructed_target,
+						TypoFixer.deconstruct(name)
+					)
+
+					if (distance > max_distance):
+						continue
+
+				result.append((distance, this.orders[name], name))
+
+		result.sort()
+
+		return [name for (distance, order, name) in result]
+
 class TypoFixer:
 	ACCEPTED_FIXES = dict()
+	INTERACTIVE = True
+	MODE = "interactive"
+	MODES = ["interactive", "auto", "report"]
+	FIXES = list()
+	REPORT_FILE = None
+	TYPE_NAMES = TypoIndex()
 
 	def deconstruct (string: str) -> dict[str, int]:
 		result = dict()
@@ -58,73 +492,46 @@ class TypoFixer:
 
 	def compare_deconstructed (a: dict[str, int], b: dict[str, int]) -> int:
 		result = 0
-		keys = set()
-		keys.update(a.keys())
-		keys.update(b.keys())
 
-		for k in keys:
-			in_a = 0
-			in_b = 0
+		for (k, in_a) in a.items():
+			in_b = b.get(k)
 
-			if k in a:
-				in_a = a[k]
-
-			if k in b:
-				in_b = b[k]
+			if (in_b is None):
+				result += in_a
+			else:
+				result += abs(in_a - in_b)
 
-			result += abs(in_a - in_b)
+		for (k, in_b) in b.items():
+			if (k not in a):
+				result += in_b
 
 		return result
 
-	def find_closest_to (target: str, candidates: list[str], percent) -> list[(str, int)]:
-		target_len = len(target)
-		max_distance = max(target_len * percent, 3)
-		max_candidate_len = target_len + max_distance
-		min_candidate_len = target_len - max_distance
-		result = list()
-
-		deconstructed_target = TypoFixer.deconstruct(target)
-
-		for c in candidates:
-			c_len = len(c)
-
-			if (
-				(c_len >= min_candidate_len)
-				and (c_len <= max_candidate_len)
-			):
-				c_score = TypoFixer.compare_deconstructed(
-					deconstructed_target,
-					TypoFixer.deconstruct(c)
-				)
-
-				if (c_score <= max_distance):
-					result.append((c, c_score))
-
-		def get_score (a: (str, int)) -> int:
-			(v, result) = a
-
-			return result
-
-		result.sort(key = get_score)
-
-		return [a for (a, b) in result]
-
 	def propose_fix (
+		context,
 		token,
 		group_name: str,
 		target: str,
-		candidates: list[str]
+		candidates
 	) -> str | None:
 		current_fix = TypoFixer.ACCEPTED_FIXES.get(target)
 
 		if (current_fix is not None):
 			return current_fix
 
-		candidates = TypoFixer.find_closest_to(target, candidates, 0.25)
+		if ((TypoFixer.MODE == "interactive") and not TypoFixer.INTERACTIVE):
+			return None
+
+		candidates = candidates.find_closest_to(target, 0.25)
 		if (len(candidates) == 0):
 			return None
 
-		prompt = DragomanParser.get_cursor(token)
+		if (TypoFixer.MODE != "interactive"):
+			TypoFixer.ACCEPTED_FIXES[target] = candidates[0]
+
+			return candidates[0]
+
+		prompt = context.get_cursor(token)
 		prompt += "\n[?] Unknown "
 		prompt += group_name
 		prompt += " \""
@@ -143,6 +550,8 @@ class TypoFixer:
 
 		prompt_prefix = ""
 
+		Log.flush()
+
 		while True:
 			choice = int(input(prompt_prefix + prompt))
 			prompt_prefix = ""
@@ -160,31 +569,101 @@ class TypoFixer:
 				choice = None
 
 	def apply_fix (
-		filename,
+		context,
 		t,
 		target: str,
 		replacement: str
 	):
-		data = []
+		# Files are only rewritten once parsed, see apply_fixes.
+		location = context.get_location(t)
 
-		DragomanParser.print_warning(
-			(
-				"Replacing \""
-				+ target
-				+ "\" with \""
-				+ replacement
-				+ "\"."
-			),
-			t
+		if (TypoFixer.MODE == "report"):
+			# Reported names fail the run, but parsing goes on with the fix.
+			context.print_error(
+				(
+					"Unknown name \""
+					+ target
+					+ "\", assuming \""
+					+ replacement
+					+ "\"."
+				),
+				t,
+				"unknown-name"
+			)
+			context.assume_name(t)
+		else:
+			context.print_warning(
+				(
+					"Replacing \""
+					+ target
+					+ "\" with \""
+					+ replacement
+					+ "\"."
+				),
+				t,
+				"name-fixed"
+			)
+
+		context.add_fix(t.index, target, replacement)
+		TypoFixer.FIXES.append(
+			{
+				"file": location.get_filename(),
+				"line": location.get_line(),
+				"column": location.get_column(),
+				"name": target,
+				"replacement": replacement,
+				"applied": (TypoFixer.MODE != "report")
+			}
 		)
 
-		with open(filename, 'r') as file:
-			data = file.readlines()
+	def apply_fixes (context):
+		fixes = context.get_fixes()
+
+		if ((len(fixes) == 0) or (TypoFixer.MODE == "report")):
+			return
+
+		content = context.get_source().get_content()
+		result = list()
+		position = 0
+
+		for (index, target, replacement) in sorted(fixes):
+			end = index + len(target)
+
+			if ((index < position) or (content[index:end].lower() != target)):
+				Log.print_warning(
+					"Unable to replace \""
+					+ target
+					+ "\" in "
+					+ context.get_filename()
+					+ "."
+				)
+
+				continue
+
+			result.append(content[position:index])
+			result.append(replacement)
+			position = end
+
+		result.append(content[position:])
 
-		data[t.lineno - 1] = data[t.lineno - 1].replace(target, replacement, 1)
+		path = Path(context.get_filename())
+		temp_path = path.with_name("." + path.name + ".tmp" + str(os.getpid()))
 
-		with open(filename, 'w') as file:
-			file.writelines(data)
+		with open(temp_path, 'w') as file:
+			file.write("".join(result))
+
+		os.replace(temp_path, path)
+
+	def write_report ():
+		if (TypoFixer.REPORT_FILE is None):
+			return
+
+		with open(TypoFixer.REPORT_FILE, 'w') as file:
+			json.dump(
+				{"mode": TypoFixer.MODE, "fixes": TypoFixer.FIXES},
+				file,
+				indent=1
+			)
 
 ################################################################################
 #### CODE GENERATION UTILITY ###################################################
@@ -192,39 +671,56 @@ class TypoFixer:
 class CodeWriter:
 	DEFAULT_INDENT = "\t"
 	def __init__ (this, filepath: Path):
-		filepath.parent.mkdir(parents=True, exist_ok=True)
-		this.file = open(filepath, 'w')
+		this.filepath = filepath
+		# Output is kept as a list of fragments, joined once in finalize().
+		this.fragments = list()
+		this.emit = this.fragments.append
 		this.indent_style = CodeWriter.DEFAULT_INDENT
 		this.indent_level = 0
+		this.indent_prefixes = [""]
+		this.indent_prefix = ""
 		this.buffer = None
 		this.buffer_ends_line = False
 
 	def set_indent_style (this, indent: str):
 		this.indent_style = indent
+		this.indent_prefixes = [""]
+		this.update_indent_prefix()
+
+	def update_indent_prefix (this):
+		prefixes = this.indent_prefixes
+
+		while (len(prefixes) <= this.indent_level):
+			prefixes.append(prefixes[-1] + this.indent_style)
+
+		this.indent_prefix = prefixes[this.indent_level]
 
 	def decrease_indent (this):
 		if (this.indent_level == 0):
 			Log.print_warning("Unable to lower indent level further.")
 		else:
 			this.indent_level -= 1
+			this.indent_prefix = this.indent_prefixes[this.indent_level]
 
 	def increase_indent (this):
 		this.indent_level += 1
+		this.update_indent_prefix()
 
 	def indent (this):
-		this.file.write(this.indent_style * this.indent_level)
+		this.emit(this.indent_prefix)
 
 	def discard_buffer (this):
 		this.buffer = None
 		this.buffer_ends_line = False
 
 	def write_buffer (this):
-		this.file.write(this.buffer)
+		this.emit(this.buffer)
 
 		if (this.buffer_ends_line):
-			this.file.write("\n")
+			this.emit("\n")
 
-		this.discard_buffer()
+		this.buffer = None
+		this.buffer_ends_line = False
 
 	def mark_buffer_as_ending_line (this):
 		this.buffer_ends_line = True
@@ -236,34 +732,64 @@ class CodeWriter:
 		if (this.buffer is not None):
 			this.write_buffer()
 
-		this.file.write(s)
+		this.emit(s)
 
 	def newline (this):
 		if (this.buffer is not None):
 			this.write_buffer()
 
-		this.file.write("\n")
+		this.emit("\n")
 
 	def start_line (this, s: str):
 		if (this.buffer is not None):
 			this.write_buffer()
 
-		this.indent()
-		this.file.write(s)
+		this.emit(this.indent_prefix)
+		this.emit(s)
 
 	def line (this, s: str):
 		if (this.buffer is not None):
 			this.write_buffer()
 
-		this.indent()
-		this.file.write(s)
-		this.newline()
+		this.emit(this.indent_prefix)
+		this.emit(s)
+		this.emit("\n")
 
 	def finalize (this):
 		if (this.buffer is not None):
 			this.write_buffer()
 
-		this.file.close()
+		content = "".join(this.fragments)
+		this.fragments.clear()
+
+		with Profiler.phase("write", str(this.filepath)):
+			this.write_content(content)
+
+	def write_content (this, content: str):
+		# Untouched files are not recompiled by the tools that use them.
+		try:
+			with open(this.filepath, 'r', newline='') as file:
+				if (file.read() == content):
+					return
+		except (OSError, UnicodeDecodeError):
+			pass
+
+		this.filepath.parent.mkdir(parents=True, exist_ok=True)
+		temp_path = this.filepath.with_name(
+			"." + this.filepath.name + ".tmp" + str(os.getpid())
+		)
+
+		# Written as compared, or files never match where newlines differ.
+		with open(temp_path, 'w', newline='') as file:
+			file.write(content)
+
+		# Replaced files keep their permissions.
+		try:
+			shutil.copymode(this.filepath, temp_path)
+		except OSError:
+			pass
+
+		os.replace(temp_path, this.filepath)
 
 	def title_line (this, char: str, title: str, pre: int, total: int):
 		this.start_line(char * pre)
@@ -271,18 +797,240 @@ class CodeWriter:
 		this.append(char * (total - pre - len(title)))
 		this.newline()
 
-class TokenLocation:
-	def __init__ (this, token):
-		this.filename = DragomanParser.CURRENT_FILE
-		this.line = token.lineno
-		this.column = token.index - DragomanParser.COLUMN_STARTS_AT
+################################################################################
+#### INCREMENTAL REGENERATION ##################################################
+################################################################################
+class OutputManifest:
+	FILENAME = ".dragoman-manifest.json"
+	FORCE = False
+	# When set, other types are left as generated by the previous run.
+	AFFECTED_TYPES = None
+
+	def compute_version (backend_file: str) -> str:
+		hasher = hashlib.sha256()
+		hasher.update(ParseCache.get_signature().encode())
+		hasher.update(Path(backend_file).read_bytes())
+
+		return hasher.hexdigest()
+
+	def describe_type (t) -> list:
+		markers = sorted(t.markers)
+
+		if (isinstance(t, ObjectType)):
+			return [
+				"object",
+				t.get_name(),
+				markers,
+				[
+					[
+						e.get_name(),
+						e.get_tag(),
+						e.get_type().get_name(),
+						e.maybe_get_const_value()
+					]
+					for e in t.get_entries()
+				]
+			]
+		elif (isinstance(t, EnumType)):
+			return [
+				"enum",
+				t.get_name(),
+				t.get_parent_type().get_name(),
+				markers,
+				[[e.get_name(), e.get_tag()] for e in t.get_entries()]
+			]
+		elif (isinstance(t, PolymorphType)):
+			return [
+				"polymorph",
+				t.get_name(),
+				t.get_key_field_name(),
+				t.get_key_field_tag(),
+				t.get_enum_type().get_name(),
+				markers,
+				[
+					[
+						c.get_name(),
+						c.get_type().get_name(),
+						c.get_enum_entry().get_tag()
+					]
+					for c in t.get_cases()
+				],
+				[
+					[n, ft.get_name(), t.get_shared_field_tag(n)]
+					for (n, ft) in sorted(t.get_shared_fields().items())
+				]
+			]
+
+		return [t.get_name()]
+
+	def get_dependencies (t) -> list:
+		if (isinstance(t, ObjectType) or isinstance(t, PolymorphType)):
+			return sorted(t.get_dependencies(), key = lambda d: d.get_name())
+
+		return []
+
+	def __init__ (this, folder: Path, backend: str, version: str, options: dict):
+		this.folder = Path(folder)
+		this.header = {"backend": backend, "version": version, "options": options}
+		this.previous = dict()
+		this.entries = dict()
+		this.fingerprints = dict()
+		this.updated = 0
+
+		if (OutputManifest.FORCE):
+			return
+
+		try:
+			with open(this.folder / OutputManifest.FILENAME, 'r') as file:
+				data = json.load(file)
+		except (OSError, ValueError):
+			return
+
+		if (data.get("header") == this.header):
+			this.previous = data.get("types", dict())
+
+	def get_fingerprint (this, t) -> str:
+		result = this.fingerprints.get(t)
+
+		if (result is None):
+			# Covers the definitions of everything this type relies on.
+			hasher = hashlib.sha256()
+			hasher.update(json.dumps(OutputManifest.describe_type(t)).encode())
+
+			for d in OutputManifest.get_dependencies(t):
+				hasher.update(this.get_fingerprint(d).encode())
+
+			result = hasher.hexdigest()
+			this.fingerprints[t] = result
+
+		return result
+
+	def needs_update (this, t, filename: str) -> bool:
+		previous = this.previous.get(t.get_name())
+
+		if (
+			(OutputManifest.AFFECTED_TYPES is not None)
+			and (t not in OutputManifest.AFFECTED_TYPES)
+			and (previous is not None)
+			and (previous.get("file") == filename)
+			and (this.folder / filename).is_file()
+		):
+			this.entries[t.get_name()] = previous
+
+			return False
+
+		fingerprint = this.get_fingerprint(t)
+
+		this.entries[t.get_name()] = {
+			"hash": fingerprint,
+			"file": filename,
+			"dependencies": [
+				d.get_name() for d in OutputManifest.get_dependencies(t)
+			]
+		}
+
+		if (
+			(previous is not None)
+			and (previous.get("hash") == fingerprint)
+			and (previous.get("file") == filename)
+			and (this.folder / filename).is_file()
+		):
+			return False
+
+		this.updated += 1
+
+		return True
+
+	def finalize (this):
+		path = this.folder / OutputManifest.FILENAME
+		temp_path = path.with_suffix(".tmp" + str(os.getpid()))
+
+		this.folder.mkdir(parents=True, exist_ok=True)
+
+		with open(temp_path, 'w') as file:
+			json.dump(
+				{"header": this.header, "types": this.entries},
+				file,
+				indent=1,
+				sort_keys=True
+			)
+
+		os.replace(temp_path, path)
+
+		Log.print_debug(
+			"Regenerated "
+			+ str(this.updated)
+			+ " of "
+			+ str(len(this.entries))
+			+ " type(s)."
+		)
+
+class SourceFile:
+	def __init__ (this, filename: str, content: str):
+		this.filename = filename
+		this.content = content
+		this.line_starts = [0]
 
-		if (this.column < 0):
-			this.column = 0
+		index = content.find("\n")
+
+		while (index != -1):
+			this.line_starts.append(index + 1)
+			index = content.find("\n", index + 1)
 
 	def get_filename (this) -> str:
 		return this.filename
 
+	def get_content (this) -> str:
+		return this.content
+
+	def get_line_number (this, index: int) -> int:
+		return bisect.bisect_right(this.line_starts, index)
+
+	def get_column (this, index: int) -> int:
+		return index - this.line_starts[this.get_line_number(index) - 1]
+
+	def get_index (this, line_number: int, column: int) -> int:
+		return this.line_starts[line_number - 1] + column
+
+	def get_line (this, line_number: int) -> str:
+		start = this.line_starts[line_number - 1]
+
+		if (line_number < len(this.line_starts)):
+			end = this.line_starts[line_number] - 1
+		else:
+			end = len(this.content)
+
+		return this.content[start:end].rstrip("\r")
+
+class TokenLocation:
+	# Filenames are shared by all locations, which only keep their index.
+	FILENAMES = list()
+	FILE_IDS = dict()
+
+	__slots__ = ("file_id", "line", "column")
+
+	def get_file_id (filename: str) -> int:
+		result = TokenLocation.FILE_IDS.get(filename)
+
+		if (result is None):
+			result = len(TokenLocation.FILENAMES)
+			TokenLocation.FILENAMES.append(filename)
+			TokenLocation.FILE_IDS[filename] = result
+
+		return result
+
+	def __init__ (this, filename: str, line: int, column: int):
+		this.file_id = TokenLocation.get_file_id(filename)
+		this.line = line
+		this.column = column
+
+	def __reduce__ (this):
+		# File ids are only valid within a process.
+		return (TokenLocation, (this.get_filename(), this.line, this.column))
+
+	def get_filename (this) -> str:
+		return TokenLocation.FILENAMES[this.file_id]
+
 	def get_line (this) -> int:
 		return this.line
 
@@ -298,9 +1046,18 @@ class TokenLocation:
 			+ str(this.get_column())
 		)
 
+	def get_diagnostic (
+		this,
+		message: str,
+		code: str | None = None
+	) -> (str | None, str, str, int, int):
+		return (code, message, this.get_filename(), this.line, this.column)
+
 class DefinedType:
 	COLLECTION = dict()
 
+	__slots__ = ("name",)
+
 	def get (name: str):
 		return DefinedType.COLLECTION[name]
 
@@ -321,17 +1078,60 @@ class DefinedType:
 			return False
 		else:
 			DefinedType.COLLECTION[this.name] = this
+			TypoFixer.TYPE_NAMES.add(this.name)
 
 			return True
 
+	def unregister (this):
+		if (DefinedType.COLLECTION.get(this.name) is this):
+			del DefinedType.COLLECTION[this.name]
+			TypoFixer.TYPE_NAMES.remove(this.name)
+
+	def forget_interned (types: set):
+		# Drops the interned types built on any of these, even indirectly, so
+		# that they can be neither used nor kept alive any longer.
+		forgotten = set(types)
+		has_changed = True
+
+		while (has_changed):
+			has_changed = False
+
+			for interned in [
+				ArrayOfDefinedType.INTERNED,
+				SetOfDefinedType.INTERNED,
+				DictOfDefinedType.INTERNED
+			]:
+				for (key, t) in list(interned.items()):
+					if (not forgotten.isdisjoint(t.get_components())):
+						del interned[key]
+						forgotten.add(t)
+						has_changed = True
+
 	def to_string (this):
 		return this.name
 
 class ArrayOfDefinedType (DefinedType):
+	INTERNED = dict()
+
+	__slots__ = ("parent",)
+
+	def intern (parent):
+		# Each distinct composite type only exists once, so identity is equality.
+		result = ArrayOfDefinedType.INTERNED.get(parent)
+
+		if (result is None):
+			result = ArrayOfDefinedType(parent)
+			ArrayOfDefinedType.INTERNED[parent] = result
+
+		return result
+
 	def __init__ (this, parent):
 		DefinedType.__init__(this, "(Array of " + parent.get_name() + ")")
 		this.parent = parent
 
+	def __reduce__ (this):
+		return (ArrayOfDefinedType.intern, (this.parent,))
+
 	def compute_depth (this) -> (int, DefinedType):
 		next = this
 		depth = 0
@@ -345,15 +1145,55 @@ class ArrayOfDefinedType (DefinedType):
 	def get_parent (this):
 		return this.parent
 
+	def get_components (this) -> list[DefinedType]:
+		return [this.parent]
+
 class SetOfDefinedType (DefinedType):
+	INTERNED = dict()
+
+	__slots__ = ("parent",)
+
+	def intern (parent):
+		result = SetOfDefinedType.INTERNED.get(parent)
+
+		if (result is None):
+			result = SetOfDefinedType(parent)
+			SetOfDefinedType.INTERNED[parent] = result
+
+		return result
+
 	def __init__ (this, parent):
 		DefinedType.__init__(this, "(Set of " + parent.get_name() + ")")
 		this.parent = parent
 
+	def __reduce__ (this):
+		return (SetOfDefinedType.intern, (this.parent,))
+
 	def get_parent (this):
 		return this.parent
 
+	def get_components (this) -> list[DefinedType]:
+		return [this.parent]
+
 class DictOfDefinedType (DefinedType):
+	INTERNED = dict()
+
+	__slots__ = ("parent", "accesses", "key_type")
+
+	def intern (
+		accesses: list[(str, DefinedType)],
+		key_type : DefinedType,
+		parent: DefinedType
+	):
+		key = (tuple(accesses), key_type, parent)
+		result = DictOfDefinedType.INTERNED.get(key)
+
+		if (result is None):
+			result = DictOfDefinedType(list(accesses), key_type, parent)
+			DictOfDefinedType.INTERNED[key] = result
+
+		return result
+
 	def __init__ (
 		this,
 		accesses: list[(str, DefinedType)],
@@ -374,6 +1214,12 @@ class DictOfDefinedType (DefinedType):
 		this.accesses = accesses
 		this.key_type = key_type
 
+	def __reduce__ (this):
+		return (
+			DictOfDefinedType.intern,
+			(this.accesses, this.key_type, this.parent)
+		)
+
 	def get_parent (this) -> DefinedType:
 		return this.parent
 
@@ -383,9 +1229,14 @@ class DictOfDefinedType (DefinedType):
 	def get_key_type (this) -> DefinedType:
 		return this.key_type
 
+	def get_components (this) -> list[DefinedType]:
+		return [this.parent, this.key_type] + [t for (n, t) in this.accesses]
+
 class UserDefinedType (DefinedType):
 	COLLECTION = dict()
 
+	__slots__ = ("token", "markers")
+
 	def get (name: str):
 		return UserDefinedType.COLLECTION[name]
 
@@ -420,13 +1271,27 @@ class UserDefinedType (DefinedType):
 					+ "', defined at:\n- "
 					+ candidate.token.to_string()
 					+ "\n-"
-					+ this.token.to_string()
+					+ this.token.to_string(),
+					diagnostic=this.token.get_diagnostic(
+						"Name collision for type '"
+						+ this.name
+						+ "', also defined at "
+						+ candidate.token.get_filename()
+						+ ":"
+						+ str(candidate.token.get_line())
+						+ ".",
+						"name-collision"
+					)
 				)
 			else:
 				Log.print_error(
 					"Type definition at "
 					+ this.token.to_string()
-					+ " collides with base type name."
+					+ " collides with base type name.",
+					diagnostic=this.token.get_diagnostic(
+						"Type definition collides with base type name.",
+						"name-collision"
+					)
 				)
 
 			return False
@@ -435,7 +1300,15 @@ class UserDefinedType (DefinedType):
 		UserDefinedType.COLLECTION[this.name] = this
 		return True
 
+	def unregister (this):
+		if (UserDefinedType.COLLECTION.get(this.name) is this):
+			del UserDefinedType.COLLECTION[this.name]
+
+		DefinedType.unregister(this)
+
 class ObjectTypeEntry:
+	__slots__ = ("token", "name", "tag", "dtype", "const_value")
+
 	def __init__ (
 		this,
 		token: TokenLocation,
@@ -450,6 +1323,10 @@ class ObjectTypeEntry:
 		this.dtype = dtype
 		this.const_value = const_value
 
+		# Enum entry names are case insensitive, like all other names.
+		if ((const_value is not None) and isinstance(dtype, EnumType)):
+			this.const_value = const_value.lower()
+
 		if (
 			(const_value is not None)
 			and (
@@ -466,7 +1343,15 @@ class ObjectTypeEntry:
 				+ "' field '"
 				+ name
 				+ "' defined at "
-				+ token.to_string()
+				+ token.to_string(),
+				diagnostic=token.get_diagnostic(
+					"Cannot define const value for non-basic type '"
+					+ dtype.get_name()
+					+ "' field '"
+					+ name
+					+ "'.",
+					"invalid-const"
+				)
 			)
 
 			raise Exception
@@ -500,6 +1385,8 @@ class ObjectTypeEntry:
 class ObjectType (UserDefinedType):
 	COLLECTION = dict()
 
+	__slots__ = ("entry_from_tag", "entry_from_name", "dependencies")
+
 	def get (name: str):
 		return ObjectType.COLLECTION[name]
 
@@ -542,6 +1429,12 @@ class ObjectType (UserDefinedType):
 		else:
 			return False
 
+	def unregister (this):
+		if (ObjectType.COLLECTION.get(this.name) is this):
+			del ObjectType.COLLECTION[this.name]
+
+		UserDefinedType.unregister(this)
+
 	def get_entry_from_name (this, name: str) -> ObjectTypeEntry:
 		return this.entry_from_name[name]
 
@@ -568,6 +1461,8 @@ class ObjectType (UserDefinedType):
 		return result
 
 class EnumTypeEntry:
+	__slots__ = ("token", "name", "tag", "parent")
+
 	def __init__ (
 		this,
 		token: TokenLocation,
@@ -606,6 +1501,8 @@ class EnumTypeEntry:
 class EnumType (UserDefinedType):
 	COLLECTION = dict()
 
+	__slots__ = ("parent_type", "entry_from_tag", "entry_from_name")
+
 	def get (name: str):
 		return EnumType.COLLECTION[name]
 
@@ -651,6 +1548,12 @@ class EnumType (UserDefinedType):
 		else:
 			return False
 
+	def unregister (this):
+		if (EnumType.COLLECTION.get(this.name) is this):
+			del EnumType.COLLECTION[this.name]
+
+		UserDefinedType.unregister(this)
+
 	def to_string (this):
 		result = "(enum " + this.get_name()
 
@@ -662,6 +1565,8 @@ class EnumType (UserDefinedType):
 		return result
 
 class PolymorphTypeCase:
+	__slots__ = ("token", "name", "dtype", "eentry")
+
 	def __init__ (
 		this,
 		token: TokenLocation,
@@ -700,6 +1605,16 @@ class PolymorphTypeCase:
 class PolymorphType (UserDefinedType):
 	COLLECTION = dict()
 
+	__slots__ = (
+		"enum_type",
+		"cases",
+		"key_field_name",
+		"key_field_tag",
+		"shared_fields",
+		"shared_field_tags",
+		"dependencies"
+	)
+
 	def get (name: str):
 		return PolymorphType.COLLECTION[name]
 
@@ -788,6 +1703,12 @@ class PolymorphType (UserDefinedType):
 		else:
 			return False
 
+	def unregister (this):
+		if (PolymorphType.COLLECTION.get(this.name) is this):
+			del PolymorphType.COLLECTION[this.name]
+
+		UserDefinedType.unregister(this)
+
 	def to_string (this):
 		result = "(polymorph " + this.get_name()
 
@@ -798,6 +1719,41 @@ class PolymorphType (UserDefinedType):
 
 		return result
 
+class DependencyIndex:
+	def get_dependencies (t) -> set:
+		if (isinstance(t, ObjectType) or isinstance(t, PolymorphType)):
+			return t.get_dependencies()
+
+		return set()
+
+	def __init__ (this, types):
+		this.dependents = dict()
+
+		for t in types:
+			for d in DependencyIndex.get_dependencies(t):
+				this.dependents.setdefault(d, list()).append(t)
+
+	def get_direct_dependents (this, t) -> list[UserDefinedType]:
+		return this.dependents.get(t, list())
+
+	def get_affected (this, types) -> list[UserDefinedType]:
+		# The given types, followed by every type embedding any of them.
+		result = list()
+		visited = set()
+		pending = list(types)
+
+		while (len(pending) > 0):
+			t = pending.pop()
+
+			if (t in visited):
+				continue
+
+			visited.add(t)
+			result.append(t)
+			pending.extend(this.get_direct_dependents(t))
+
+		return sorted(result, key = lambda t: t.get_name())
+
 class NameSplitter:
 	def split (name: str):
 		return name.split("_")
@@ -828,6 +1784,13 @@ class NameSplitter:
 
 		return result[0].lower() + result[1:]
 
+class PrebuiltTables:
+	# The subset of sly's LRTable that the parser needs at runtime.
+	def __init__ (this, lr_action, lr_goto, defaulted_states):
+		this.lr_action = lr_action
+		this.lr_goto = lr_goto
+		this.defaulted_states = defaulted_states
+
 class DragomanLexer (Lexer):
 	tokens = {
 		#NUMBER,
@@ -881,138 +1844,156 @@ class DragomanLexer (Lexer):
 	@_('\r?\n')
 	def ignore_newline (this, t):
 		this.lineno += 1
-		DragomanParser.COLUMN_STARTS_AT = this.index
 
 	ignore = ' \t'
 
 	def error (this, t):
+		if (ParseSession.KEEP_GOING):
+			# The character is skipped, the form using it will likely fail too.
+			message = "Syntax error. Unexpected \"" + t.value[0] + "\"."
+			Log.print_error(
+				message,
+				this.context.get_cursor(t),
+				diagnostic=this.context.get_diagnostic(
+					message,
+					t,
+					"syntax-error"
+				)
+			)
+			this.index += 1
+
+			return None
+
+		message = "Syntax error. Unexpected \"" + str(t.value) + "\"."
 		Log.print_error(
-			"Syntax error. Unexpected \"" + str(t.value) + "\".",
-			DragomanParser.get_cursor(t)
+			message,
+			this.context.get_cursor(t),
+			diagnostic=this.context.get_diagnostic(message, t, "syntax-error")
 		)
 		raise Exception
 
 class DragomanParser (Parser):
-	COLUMN_STARTS_AT = 0
-	CURRENT_FILE = None
-	LAST_TOKEN = None
-	PARSED_FILES = set()
-	INCLUDE_DIRECTORIES = set()
 	BASIC_NAME_REGEX = r'([a-zA-Z_][a-zA-Z_0-9]*)'
 
 	tokens = DragomanLexer.tokens
 
-	def get_cursor (t, use_column = True) -> str:
-		column = t.index - DragomanParser.COLUMN_STARTS_AT
-		result = DragomanParser.CURRENT_FILE
-		result += ":" + str(t.lineno)
+	#### PARSING TABLES #########################################################
+	# Building the LALR tables is done once, then loaded from TABLES_FILE on
+	# each import. The file is ignored if it was made for a different grammar.
+	TABLES_FILE = os.environ.get(
+		"DRAGOMAN_PARSER_TABLES",
+		str(Path(__file__).parent / "dragoman.lrtables")
+	)
+
+	@classmethod
+	def _Parser__build_lrtables (cls):
+		# Replaces the step of sly's Parser._build that builds the LR tables,
+		# once the grammar is. Without that step, as may happen with another
+		# version of sly, the tables are simply built on every import.
+		build_lrtables = Parser._Parser__build_lrtables.__func__
+
+		# The debug file describes the tables, so they have to be built.
+		if (cls.debugfile):
+			return build_lrtables(cls)
+
+		hasher = hashlib.sha256()
+		hasher.update(sly.__version__.encode())
+		hasher.update(str(cls._grammar).encode())
+		signature = hasher.hexdigest()
+
+		if (cls.load_tables(cls, signature)):
+			return True
 
-		if (use_column):
-			result += "," + str(column)
+		if (not build_lrtables(cls)):
+			return False
 
-		result += "\n"
+		cls.store_tables(cls, signature)
 
-		with open(DragomanParser.CURRENT_FILE, 'r') as file:
-			line_content = file.readlines()[t.lineno - 1][:-1]
+		return True
 
-		result += line_content.replace("\t", " ")
-		result += "\n"
+	def load_tables (cls, signature: str) -> bool:
+		if (not cls.TABLES_FILE):
+			return False
 
-		if (use_column):
-			result += ' ' * column + "^"
-		else:
-			result += len(line_content) * "^"
+		try:
+			with open(cls.TABLES_FILE, 'rb') as file:
+				(file_signature, lr_action, lr_goto, defaulted_states) = (
+					pickle.load(file)
+				)
+		except Exception:
+			return False
 
-		result += "\n"
+		if (file_signature != signature):
+			return False
 
-		return result
+		cls._lrtable = PrebuiltTables(lr_action, lr_goto, defaulted_states)
 
-	def print_warning (msg, t):
-		if (isinstance(t, TokenLocation)):
-			Log.print_error(
-				"[W] "
-				+ msg
-				+ "\n"
-				+ t.to_string()
-			)
-		else:
-			Log.print_error(
-				"[W] "
-				+ msg
-				+ "\n"
-				+ DragomanParser.get_cursor(t, False)
-			)
+		return True
 
-	def print_error (msg, t):
-		if (isinstance(t, TokenLocation)):
-			Log.print_error(
-				"[E] "
-				+ msg
-				+ "\n"
-				+ t.to_string()
-			)
-		else:
-			Log.print_error(
-				"[E] "
-				+ msg
-				+ "\n"
-				+ DragomanParser.get_cursor(t, False)
-			)
+	def store_tables (cls, signature: str):
+		if (not cls.TABLES_FILE):
+			return
+
+		temp_file = cls.TABLES_FILE + ".tmp" + str(os.getpid())
+
+		try:
+			with open(temp_file, 'wb') as file:
+				pickle.dump(
+					(
+						signature,
+						cls._lrtable.lr_action,
+						cls._lrtable.lr_goto,
+						cls._lrtable.defaulted_states
+					),
+					file
+				)
+
+			os.replace(temp_file, cls.TABLES_FILE)
+		except OSError:
+			# Read-only installations just rebuild the tables every time.
+			pass
 
 	#### FILE ###################################################################
 	@_(r'file_entry file')
 	def file (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		return t
 
 	@_(r'')
 	def file (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		return t
 
 	@_(r'REQUIRE_KW ID EOP')
 	def file_entry (this, t):
-		DragomanParser.LAST_TOKEN = t
-
-		# It would be cleaner not to go for a static solution, but oh well...
-		COLUMN_STARTS_AT = DragomanParser.COLUMN_STARTS_AT
-		CURRENT_FILE = DragomanParser.CURRENT_FILE
-		LAST_TOKEN = DragomanParser.LAST_TOKEN
+		this.context.last_token = t
 
-		filename = t.ID + ".dgl"
-		found_file = False
+		session = this.context.get_session()
+		candidate = session.find_required_file(t.ID)
 
-		if (Path(filename).is_file()):
-			found_file = True
-			DragomanParser.parse_file(str(candidate))
-		else:
-			for dir in DragomanParser.INCLUDE_DIRECTORIES:
-				candidate = dir / filename
-
-				if (candidate.is_file()):
-					found_file = True
-					DragomanParser.parse_file(str(candidate))
-					break
-
-		if (not found_file):
-			DragomanParser.print_error("Could not find required file.", t )
+		if (candidate is None):
+			this.context.print_error(
+				"Could not find required file.",
+				t,
+				"missing-require"
+			)
 			raise Exception
 
-		DragomanParser.COLUMN_STARTS_AT = COLUMN_STARTS_AT
-		DragomanParser.CURRENT_FILE = CURRENT_FILE
-		DragomanParser.LAST_TOKEN = LAST_TOKEN
+		session.parse_file(str(candidate))
+		this.context.add_require(str(candidate))
 
 		return t
 
 	@_(r'ENUM_KW basic_name get_type enum_definition EOP')
+	@Profiler.timed_action("enum definition")
 	def file_entry (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		(tags, names, entries, markers) = t.enum_definition
 
-		result = EnumType(TokenLocation(t), t.basic_name, t.get_type, entries)
+		result = EnumType(this.context.get_location(t), t.basic_name, t.get_type, entries)
 
 		for m in markers:
 			result.add_marker(m)
@@ -1022,12 +2003,13 @@ class DragomanParser (Parser):
 		return t
 
 	@_(r'OBJECT_KW basic_name object_definition EOP')
+	@Profiler.timed_action("object definition")
 	def file_entry (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		(tags, names, entries, markers) = t.object_definition
 
-		result = ObjectType(TokenLocation(t), t.basic_name, entries)
+		result = ObjectType(this.context.get_location(t), t.basic_name, entries)
 
 		for m in markers:
 			result.add_marker(m)
@@ -1037,8 +2019,9 @@ class DragomanParser (Parser):
 		return t
 
 	@_(r'POLYMORPH_KW basic_name basic_name polymorph_definition EOP')
+	@Profiler.timed_action("polymorph definition")
 	def file_entry (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		enum_type = None
 		key_field_tag = None
@@ -1062,7 +2045,7 @@ class DragomanParser (Parser):
 					entry = pcase_type.get_entry_from_name(t.basic_name1)
 					entry_type = entry.get_type()
 				except Exception:
-					DragomanParser.print_error(
+					this.context.print_error(
 						(
 							"Type '"
 							+ pcase_type.get_name()
@@ -1070,84 +2053,91 @@ class DragomanParser (Parser):
 							+ t.basic_name1
 							+ "'."
 						),
-						pcase.get_token()
+						pcase.get_token(),
+						"polymorph-key-field"
 					)
 					raise Exception
 
 				if (key_field_tag == None):
 					key_field_tag = entry.get_tag()
 				elif (key_field_tag != entry.get_tag()):
-					DragomanParser.print_error(
+					this.context.print_error(
 						(
 							"Type "
-							+ entry_type.get_name()
+							+ pcase_type.get_name()
 							+ " does not use the same tag for "
 							+ t.basic_name1
 							+ " as previous entries."
 						),
-						pcase.get_token()
+						pcase.get_token(),
+						"polymorph-key-field"
 					)
 					raise Exception
-			elif (isinstance(entry, PolymorphType)):
+			elif (isinstance(pcase_type, PolymorphType)):
 				# TODO: TypoFixer use for these...
 				try:
-					entry_type = entry.get_shared_field(t.basic_name1)
+					entry_type = pcase_type.get_shared_field(t.basic_name1)
 				except Exception:
-					DragomanParser.print_error(
+					this.context.print_error(
 						(
 							"Type '"
-							+ entry.get_name()
+							+ pcase_type.get_name()
 							+ "' does not have entry '"
 							+ t.basic_name1
 							+ "' as shared."
 						),
-						pcase.get_token()
+						pcase.get_token(),
+						"polymorph-key-field"
 					)
 					raise Exception
 
-				candidate_field_tag = entry.get_shared_field_tag(t.basic_name1)
+				candidate_field_tag = pcase_type.get_shared_field_tag(
+					t.basic_name1
+				)
 
 				if (key_field_tag == None):
 					key_field_tag = candidate_field_tag
 				elif (key_field_tag != candidate_field_tag):
-					DragomanParser.print_error(
+					this.context.print_error(
 						(
 							"Entry '"
 							+ t.basic_name1
 							+ "' of target type does not use the same tag for "
-							+ entry.get_name()
+							+ pcase_type.get_name()
 							+ " as previous entries."
 						),
-						pcase.get_token()
+						pcase.get_token(),
+						"polymorph-key-field"
 					)
 					raise Exception
 			else:
-				# TODO: support for PolymorphType here.
-				DragomanParser.print_error(
+				this.context.print_error(
 					"Invalid type used for polymorph case.",
-					pcase.get_token()
+					pcase.get_token(),
+					"polymorph-case"
 				)
 				raise Exception
 
 			if (enum_type == None):
 				enum_type = entry_type
 			elif (enum_type != entry_type):
-				DragomanParser.print_error(
+				this.context.print_error(
 					(
 						"Type "
-						+ entry_type.get_name()
-						+ " does not use the same tag for "
+						+ pcase_type.get_name()
+						+ " does not use the same type for "
 						+ t.basic_name1
 						+ " as previous entries."
 					),
-					pcase.get_token()
+					pcase.get_token(),
+					"polymorph-key-field"
 				)
 				raise Exception
 
 			try:
 				entry = enum_type.get_entry_from_name(pcase.get_name())
 			except Exception:
-				DragomanParser.print_error(
+				this.context.print_error(
 					(
 						"The Enum type '"
 						+ enum_type.get_name()
@@ -1155,64 +2145,54 @@ class DragomanParser (Parser):
 						+ pcase.get_name()
 						+ "'."
 					),
-					pcase.get_token()
+					pcase.get_token(),
+					"polymorph-case"
 				)
 				raise Exception
 
 			pcase.set_enum_entry(entry)
 
 			for s in shared:
-				if (isinstance(entry, ObjectType)):
+				if (isinstance(pcase_type, ObjectType)):
 					try:
-						shared_field = entry_type.get_entry_from_name(s)
+						shared_field = pcase_type.get_entry_from_name(s)
 						shared_field_type = shared_field.get_type()
-						shared_field_tag = shared_field_type.get_tag()
+						shared_field_tag = shared_field.get_tag()
 					except Exception:
-						DragomanParser.print_error(
+						this.context.print_error(
 							(
 								"Type '"
-								+ entry.get_name()
+								+ pcase_type.get_name()
 								+ "' does not have entry '"
 								+ s
 								+ "'."
 							),
-							pcase.get_token()
+							pcase.get_token(),
+							"polymorph-shared-field"
 						)
 						raise Exception
-				elif (isinstance(entry, PolymorphType)):
-					name = t.basic_name1
+				else:
 					try:
-						shared_field_type = entry_type.get_shared_field(name)
-						shared_field_tag = entry_type.get_shared_field_tag(name)
+						shared_field_type = pcase_type.get_shared_field(s)
+						shared_field_tag = pcase_type.get_shared_field_tag(s)
 					except Exception:
-						DragomanParser.print_error(
+						this.context.print_error(
 							(
 								"Type '"
-								+ entry_type.get_name()
+								+ pcase_type.get_name()
 								+ "' does not have entry '"
 								+ s
 								+ "' as shared."
 							),
-							pcase.get_token()
+							pcase.get_token(),
+							"polymorph-shared-field"
 						)
 						raise Exception
-				else:
-					DragomanParser.print_error(
-						(
-							"Unsupported shared type of field for '"
-							+ entry_type.get_name()
-							+ "' ('"
-							+ s
-							+ "')."
-						),
-						pcase.get_token()
-					)
-					raise Exception
 
 				if (shared_field_types[s] == None):
 					shared_field_types[s] = shared_field_type
-				elif (shared_field_type[s] != shared_field_type):
-					DragomanParser.print_error(
+				elif (shared_field_types[s] != shared_field_type):
+					this.context.print_error(
 						(
 							"Entry '"
 							+ t.basic_name1
@@ -1221,14 +2201,15 @@ class DragomanParser (Parser):
 							+ s
 							+ "' as previous entries."
 						),
-						pcase.get_token()
+						pcase.get_token(),
+						"polymorph-shared-field"
 					)
 					raise Exception
 
 				if (shared_field_tags[s] == None):
 					shared_field_tags[s] = shared_field_tag
-				elif (shared_field_tag[s] != shared_field_tag):
-					DragomanParser.print_error(
+				elif (shared_field_tags[s] != shared_field_tag):
+					this.context.print_error(
 						(
 							"Entry '"
 							+ t.basic_name1
@@ -1237,20 +2218,22 @@ class DragomanParser (Parser):
 							+ s
 							+ "' as previous entries."
 						),
-						pcase.get_token()
+						pcase.get_token(),
+						"polymorph-shared-field"
 					)
 					raise Exception
 
 
 		if (enum_type is None):
-			DragomanParser.print_error(
+			this.context.print_error(
 				"No cases defined in Polymorph type.",
-				t.POLYMORPH_KW
+				t,
+				"polymorph-case"
 			)
 			raise Exception
 
 		result = PolymorphType(
-			TokenLocation(t),
+			this.context.get_location(t),
 			t.basic_name0,
 			t.basic_name1,
 			key_field_tag,
@@ -1271,23 +2254,29 @@ class DragomanParser (Parser):
 	#### GET DEFINED OBJECT #####################################################
 	@_(r'basic_name')
 	def get_type (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		try:
 			return DefinedType.get(t.basic_name)
 		except Exception as e:
 			fixed_id = TypoFixer.propose_fix(
+				this.context,
 				t,
 				"Type",
 				t.basic_name,
-				[i.get_name() for i in DefinedType.get_all()]
+				TypoFixer.TYPE_NAMES
 			)
 
 			if (fixed_id is None):
-				raise e
+				this.context.print_error(
+					"Unknown type '" + t.basic_name + "'.",
+					t,
+					"unknown-type"
+				)
+				raise Exception
 			else:
 				TypoFixer.apply_fix(
-					DragomanParser.CURRENT_FILE,
+					this.context,
 					t,
 					t.basic_name,
 					fixed_id
@@ -1299,32 +2288,33 @@ class DragomanParser (Parser):
 
 	@_(r'ARRAY_KW get_type EOP')
 	def get_type (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
-		return ArrayOfDefinedType(t.get_type)
+		return ArrayOfDefinedType.intern(t.get_type)
 
 	@_(r'SET_KW get_type EOP')
 	def get_type (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		if (
 			isinstance(t.get_type, UserDefinedType)
 		):
-			DragomanParser.print_error(
+			this.context.print_error(
 				(
 					"Cannot use this type ('"
 					+ t.get_type.get_name()
 					+ "') in a set. Only base types are allowed."
 				),
-				t
+				t,
+				"invalid-container"
 			)
 			raise Exception
 
-		return SetOfDefinedType(t.get_type)
+		return SetOfDefinedType.intern(t.get_type)
 
 	@_(r'DICT_KW composed_variable_name get_type EOP')
 	def get_type (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		next_type = t.get_type
 		accesses = []
@@ -1337,7 +2327,7 @@ class DragomanParser (Parser):
 					next_type = field.get_type()
 				except Exception as e:
 					# TODO: TypoFixer
-					DragomanParser.print_error(
+					this.context.print_error(
 						(
 							"There is no '"
 							+ access
@@ -1345,7 +2335,8 @@ class DragomanParser (Parser):
 							+ next_type.get_name()
 							+ "'"
 						),
-						t
+						t,
+						"invalid-dict-key"
 					)
 					raise Exception
 			elif (isinstance(next_type, PolymorphType)):
@@ -1353,7 +2344,7 @@ class DragomanParser (Parser):
 					next_type = next_type.get_shared_field(access)
 				except Exception as e:
 					# TODO: TypoFixer
-					DragomanParser.print_error(
+					this.context.print_error(
 						(
 							"There is no '"
 							+ access
@@ -1361,7 +2352,8 @@ class DragomanParser (Parser):
 							+ next_type.get_name()
 							+ "'"
 						),
-						t
+						t,
+						"invalid-dict-key"
 					)
 					raise Exception
 
@@ -1369,46 +2361,92 @@ class DragomanParser (Parser):
 			isinstance(next_type, UserDefinedType)
 			and not isinstance(next_type, EnumType)
 		):
-			DragomanParser.print_error(
+			this.context.print_error(
 				(
 					"Dictionaries cannot use type '"
 					+ next_type.get_name()
 					+ "' for keys."
 				),
-				t
+				t,
+				"invalid-dict-key"
 			)
 			raise Exception
 
-		return DictOfDefinedType(accesses, next_type, t.get_type)
+		return DictOfDefinedType.intern(accesses, next_type, t.get_type)
 
 	#### MAYBE CONSTANT #########################################################
 	@_(r'')
 	def maybe_const (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		return None
 
 	@_(r'CONST_KW ID EOP')
 	def maybe_const (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		return t.ID
 
+	# Backends write these values as they are.
+	CONST_VALUE_REGEXES = {
+		"integer": re.compile(r'[\-\+]?[0-9]+'),
+		"float": re.compile(r'[\-\+]?[0-9]+(\.[0-9]+)?([eE][\-\+]?[0-9]+)?'),
+		"boolean": re.compile(r'(?i:true|false)'),
+	}
+
+	def check_const_value (this, t, entry: ObjectTypeEntry):
+		value = entry.maybe_get_const_value()
+		dtype = entry.get_type()
+
+		if (value is None):
+			return
+
+		if (isinstance(dtype, EnumType)):
+			try:
+				dtype.get_entry_from_name(value)
+			except Exception:
+				this.context.print_error(
+					"Unknown entry '" + value + "' in " + dtype.get_name() + ".",
+					t,
+					"invalid-const"
+				)
+				raise Exception
+
+			return
+
+		regex = DragomanParser.CONST_VALUE_REGEXES.get(dtype.get_name())
+
+		if ((regex is not None) and (regex.fullmatch(value) is None)):
+			this.context.print_error(
+				(
+					"Invalid const value '"
+					+ value
+					+ "' for "
+					+ dtype.get_name()
+					+ " entry '"
+					+ entry.get_name()
+					+ "'."
+				),
+				t,
+				"invalid-const"
+			)
+			raise Exception
+
 	#### OBJECT #################################################################
 	@_(r'')
 	def object_definition (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		return (set(), set(), list(), set())
 
 	@_(r'ENTRY_KW basic_name ID get_type maybe_const EOP object_definition')
 	def object_definition (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		(names, tags, entries, markers) = t.object_definition
 
 		result = ObjectTypeEntry(
-			TokenLocation(t),
+			this.context.get_location(t),
 			t.basic_name,
 			t.ID,
 			t.get_type,
@@ -1416,34 +2454,22 @@ class DragomanParser (Parser):
 		)
 
 		if (result.get_name() in names):
-			DragomanParser.print_error(
+			this.context.print_error(
 				"Duplicate name '" + result.get_name() + "'",
-				t
+				t,
+				"duplicate-name"
 			)
 			raise Exception
 
 		if (result.get_tag() in tags):
-			DragomanParser.print_error(
+			this.context.print_error(
 				"Duplicate tag '" + result.get_tag() + "'",
-				t
+				t,
+				"duplicate-tag"
 			)
 			raise Exception
 
-		if ((t.maybe_const is not None) and isinstance(t.get_type, EnumType)):
-			try:
-				t.get_type.get_entry_from_name(t.maybe_const)
-			except Exception as e:
-				DragomanParser.print_error(
-					(
-						"Unknown entry '"
-						+ t.maybe_const
-						+ "' in "
-						+ t.get_type.get_name()
-						+ "."
-					),
-					t
-				)
-				raise e
+		this.check_const_value(t, result)
 
 		names.add(result.get_name())
 		tags.add(result.get_tag())
@@ -1453,12 +2479,12 @@ class DragomanParser (Parser):
 
 	@_(r'ENTRY_KW basic_name get_type maybe_const EOP object_definition')
 	def object_definition (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		(names, tags, entries, markers) = t.object_definition
 
 		result = ObjectTypeEntry(
-			TokenLocation(t),
+			this.context.get_location(t),
 			t.basic_name,
 			"f" + str(len(tags)),
 			t.get_type,
@@ -1466,23 +2492,27 @@ class DragomanParser (Parser):
 		)
 
 		if (result.get_name() in names):
-			DragomanParser.print_error(
+			this.context.print_error(
 				"Duplicate name '" + result.get_name() + "'",
-				t.ENTRY_KW
+				t,
+				"duplicate-name"
 			)
 			raise Exception
 
 		if (result.get_tag() in tags):
-			DragomanParser.print_error(
+			this.context.print_error(
 				(
 					"Automatic tag '"
 					+ result.get_tag()
 					+ "' conflicts with manual one."
 				),
-				t.ENTRY_KW
+				t,
+				"duplicate-tag"
 			)
 			raise Exception
 
+		this.check_const_value(t, result)
+
 		names.add(result.get_name())
 		tags.add(result.get_tag())
 		entries.append(result)
@@ -1491,7 +2521,7 @@ class DragomanParser (Parser):
 
 	@_(r'MARKERS_KW id_set EOP object_definition')
 	def object_definition (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		(names, tags, entries, markers) = t.object_definition
 
@@ -1503,29 +2533,31 @@ class DragomanParser (Parser):
 	#### ENUM ###################################################################
 	@_(r'')
 	def enum_definition (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		return (set(), set(), list(), set())
 
 	@_(r'ENTRY_KW basic_name ID EOP enum_definition')
 	def enum_definition (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		(names, tags, entries, markers) = t.enum_definition
 
-		result = EnumTypeEntry(TokenLocation(t), t.basic_name, t.ID)
+		result = EnumTypeEntry(this.context.get_location(t), t.basic_name, t.ID)
 
 		if (result.get_name() in names):
-			DragomanParser.print_error(
+			this.context.print_error(
 				"Duplicate name '" + result.get_name() + "'",
-				t.ENTRY_KW
+				t,
+				"duplicate-name"
 			)
 			raise Exception
 
 		if (result.get_tag() in tags):
-			DragomanParser.print_error(
+			this.context.print_error(
 				"Duplicate tag '" + result.get_tag() + "'",
-				t.ENTRY_KW
+				t,
+				"duplicate-tag"
 			)
 			raise Exception
 
@@ -1537,7 +2569,7 @@ class DragomanParser (Parser):
 
 	@_(r'MARKERS_KW id_set EOP enum_definition')
 	def enum_definition (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		(names, tags, entries, markers) = t.enum_definition
 
@@ -1549,22 +2581,23 @@ class DragomanParser (Parser):
 	#### POLYMORPH ##############################################################
 	@_(r'')
 	def polymorph_definition (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		return (dict(), set(), set())
 
 	@_(r'CASE_KW basic_name get_type EOP polymorph_definition')
 	def polymorph_definition (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		(cases, shared, markers) = t.polymorph_definition
 
-		result = PolymorphTypeCase(TokenLocation(t), t.basic_name, t.get_type)
+		result = PolymorphTypeCase(this.context.get_location(t), t.basic_name, t.get_type)
 
 		if (result.get_name() in cases):
-			DragomanParser.print_error(
+			this.context.print_error(
 				"Duplicate case '" + result.get_name() + "'",
-				t.CASE_KW
+				t,
+				"duplicate-case"
 			)
 			raise Exception
 
@@ -1574,7 +2607,7 @@ class DragomanParser (Parser):
 
 	@_(r'MARKERS_KW id_set EOP polymorph_definition')
 	def polymorph_definition (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		(cases, shared, markers) = t.polymorph_definition
 
@@ -1585,7 +2618,7 @@ class DragomanParser (Parser):
 
 	@_(r'SHARED_KW id_set EOP polymorph_definition')
 	def polymorph_definition (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 
 		(cases, shared, markers) = t.polymorph_definition
 
@@ -1597,9 +2630,9 @@ class DragomanParser (Parser):
 	#### ID SET #################################################################
 	@_(r'ID')
 	def basic_name (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 		if (not re.match(DragomanParser.BASIC_NAME_REGEX, t.ID)):
-			DragomanParser.print_error(
+			this.context.print_error(
 				(
 					"Invalid basic name '"
 					+ t.ID
@@ -1607,7 +2640,8 @@ class DragomanParser (Parser):
 					+ DragomanParser.BASIC_NAME_REGEX
 					+ "'."
 				),
-				t.ID
+				t,
+				"invalid-name"
 			)
 			raise Exception
 
@@ -1615,11 +2649,11 @@ class DragomanParser (Parser):
 
 	@_(r'ID')
 	def composed_variable_name (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 		result = t.ID.split('.')
 		for access in result:
 			if (not re.match(DragomanParser.BASIC_NAME_REGEX, access)):
-				DragomanParser.print_error(
+				this.context.print_error(
 					(
 						"Invalid basic name '"
 						+ access
@@ -1629,7 +2663,8 @@ class DragomanParser (Parser):
 						+ DragomanParser.BASIC_NAME_REGEX
 						+ "'."
 					),
-					t.ID
+					t,
+					"invalid-name"
 				)
 				raise Exception
 		return result
@@ -1637,12 +2672,12 @@ class DragomanParser (Parser):
 	#### ID SET #################################################################
 	@_(r'')
 	def id_set (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 		return set()
 
 	@_(r'basic_name id_set')
 	def id_set (this, t):
-		DragomanParser.LAST_TOKEN = t
+		this.context.last_token = t
 		prev = t.id_set
 
 		prev.add(t.basic_name)
@@ -1651,120 +2686,2060 @@ class DragomanParser (Parser):
 
 	#############################################################################
 	def error (this, t):
+		if (t is None):
+			message = (
+				"Syntax error. Unexpected end of "
+				+ ("form" if ParseSession.KEEP_GOING else "file")
+				+ "."
+			)
+			Log.print_error(
+				message,
+				this.context.get_filename(),
+				diagnostic=(
+					"syntax-error",
+					message,
+					this.context.get_filename(),
+					None,
+					None
+				)
+			)
+			raise Exception
+
+		message = "Syntax error. Unexpected \"" + str(t.value) + "\"."
 		Log.print_error(
-			"Syntax error. Unexpected \"" + str(t.value) + "\".",
-			DragomanParser.get_cursor(t)
+			message,
+			this.context.get_cursor(t),
+			diagnostic=this.context.get_diagnostic(message, t, "syntax-error")
 		)
 		raise Exception
 
-	def parse_file (filename):
-		module_name = Path(filename).stem
-		if (module_name in DragomanParser.PARSED_FILES):
-			Log.print_debug(
-				"Module "
-				+ module_name
-				+ " already parsed, skipping file "
-				+ filename
-				+ "."
-			)
-		else:
-			# Needs to search all include directories/subdirectories
-			with open(filename, 'r') as file:
-				Log.print_debug("Parsing " + filename + "...")
+################################################################################
+#### PARSING SESSION ###########################################################
+################################################################################
+class ParseContext:
+	def __init__ (this, session, source: SourceFile):
+		this.session = session
+		this.source = source
+		this.requires = list()
+		this.fixes = list()
+		this.last_token = None
+		# Indices of top-level forms, and those parsed with assumed names.
+		this.form_starts = list()
+		this.assuming_forms = set()
+
+	def get_session (this):
+		return this.session
+
+	def get_source (this) -> SourceFile:
+		return this.source
 
-				lexer = DragomanLexer()
-				parser = DragomanParser()
-				DragomanParser.CURRENT_FILE = filename
+	def get_filename (this) -> str:
+		return this.source.get_filename()
 
-				try:
-					parser.parse(lexer.tokenize(file.read()))
-				except Exception as e:
-					DragomanParser.print_error(str(e), DragomanParser.LAST_TOKEN)
-					file.close()
-					raise e
+	def get_requires (this) -> list[str]:
+		return this.requires
 
-				file.close()
+	def add_require (this, filename: str):
+		this.requires.append(filename)
 
-			DragomanParser.PARSED_FILES.add(module_name)
-			Log.print_debug("Loaded module " + module_name + ".")
+	def get_fixes (this) -> list[(int, str, str)]:
+		return this.fixes
 
-class Dragoman:
-	OUTPUT_FOLDER = "."
+	def add_fix (this, index: int, target: str, replacement: str):
+		this.fixes.append((index, target, replacement))
 
-	def initialize ():
-		t0 = DefinedType("string")
-		t0.register()
+	def track_forms (this, tokens):
+		for t in tokens:
+			if (t.type in ParseSession.TOP_LEVEL_TOKENS):
+				this.form_starts.append(t.index)
 
-		t0 = DefinedType("integer")
-		t0.register()
+			yield t
 
-		t0 = DefinedType("boolean")
-		t0.register()
+	def get_form (this, index: int) -> int:
+		return bisect.bisect_right(this.form_starts, index)
 
-		t0 = DefinedType("float")
-		t0.register()
+	def assume_name (this, t):
+		# Errors following from an assumed name are not reported, see
+		# print_error, as that name may not be the intended one.
+		this.assuming_forms.add(this.get_form(t.index))
 
-		argparser = argparse.ArgumentParser()
-		argparser.add_argument(
-			"dgl_file",
-			type=Path,
-			nargs=1,
-			help="DGL description entry point."
-		)
-		argparser.add_argument(
-			"--roles",
-			type=str,
-			nargs='*',
-			help="Roles for this target."
-		)
-		argparser.add_argument(
-			"--output-folder",
-			type=Path,
-			nargs=1,
-			help="Where to output files"
-		)
-		argparser.add_argument(
-			"--include",
-			type=Path,
-			nargs='*',
-			help="Where to look for files"
-		)
-		argparser.add_argument(
-			"--indentation",
-			type=str,
-			nargs=1,
-			help="What to use as indentation"
+	def is_assuming (this, t) -> bool:
+		if (len(this.assuming_forms) == 0):
+			return False
+
+		if (isinstance(t, TokenLocation)):
+			if (t.get_filename() != this.get_filename()):
+				return False
+
+			index = this.source.get_index(t.get_line(), t.get_column())
+		else:
+			index = t.index
+
+		return (this.get_form(index) in this.assuming_forms)
+
+	def get_location (this, t) -> TokenLocation:
+		return TokenLocation(
+			this.source.get_filename(),
+			this.source.get_line_number(t.index),
+			this.source.get_column(t.index)
 		)
 
-		return argparser
+	def get_cursor (this, t, use_column = True) -> str:
+		source = this.source
+		line_number = source.get_line_number(t.index)
+		column = source.get_column(t.index)
+		result = source.get_filename()
+		result += ":" + str(line_number)
 
-	def handle_arguments (args):
-		if (args.include is not None):
-			for dir in args.include:
-				DragomanParser.INCLUDE_DIRECTORIES.add(dir)
+		if (use_column):
+			result += "," + str(column)
 
-		if (args.output_folder is not None):
-			Dragoman.OUTPUT_FOLDER = args.output_folder[0]
+		result += "\n"
 
-		if (args.indentation is not None):
-			CodeWriter.DEFAULT_INDENT = args.indentation[0]
+		line_content = source.get_line(line_number)
 
-	def print ():
-		print("---- Enum Types:")
-		for e in EnumType.get_all():
-			print(e.to_string())
+		result += line_content.replace("\t", " ")
+		result += "\n"
 
-		print("\n---- Object Types:")
-		for e in ObjectType.get_all():
-			print(e.to_string())
+		if (use_column):
+			result += ' ' * column + "^"
+		else:
+			result += len(line_content) * "^"
 
-		print("\n---- Polymorph Types:")
-		for e in PolymorphType.get_all():
-			print(e.to_string())
+		result += "\n"
 
-if __name__ == '__main__':
-	Dragoman.initialize()
+		return result
+
+	def get_diagnostic (this, msg, t, code = None) -> tuple:
+		if (not isinstance(t, TokenLocation)):
+			t = this.get_location(t)
+
+		return t.get_diagnostic(msg, code)
+
+	def print_warning (this, msg, t, code = None):
+		if (isinstance(t, TokenLocation)):
+			Log.print_warning(
+				"[W] "
+				+ msg
+				+ "\n"
+				+ t.to_string(),
+				diagnostic=this.get_diagnostic(msg, t, code)
+			)
+		else:
+			Log.print_warning(
+				"[W] "
+				+ msg
+				+ "\n"
+				+ this.get_cursor(t, False),
+				diagnostic=this.get_diagnostic(msg, t, code)
+			)
 
-	DragomanParser.parse_file('test')
+	def print_error (this, msg, t, code = None):
+		if (
+			(code not in ["unknown-name", "unknown-type"])
+			and this.is_assuming(t)
+		):
+			Log.print_debug("Not reported, as it may be caused by a typo: " + msg)
+
+			return
+
+		if (isinstance(t, TokenLocation)):
+			Log.print_error(
+				"[E] "
+				+ msg
+				+ "\n"
+				+ t.to_string(),
+				diagnostic=this.get_diagnostic(msg, t, code)
+			)
+		else:
+			Log.print_error(
+				"[E] "
+				+ msg
+				+ "\n"
+				+ this.get_cursor(t, False),
+				diagnostic=this.get_diagnostic(msg, t, code)
+			)
+
+class ParseSession:
+	REQUIRE_REGEX = re.compile(
+		r'(?i:\(REQUIRE)[ \t\r\n]+([\&a-zA-Z_0-9,.\-%#/\+\':]+|\+|\-)[ \t\r\n]*\)'
+	)
+	COMMENT_REGEX = re.compile(r';;.*')
+	PENDING_MODULES = (None, list())
+	# Keep parsing after errors, resuming at the next top-level form.
+	KEEP_GOING = False
+	TOP_LEVEL_TOKENS = {"ENUM_KW", "OBJECT_KW", "POLYMORPH_KW", "REQUIRE_KW"}
+
+	def __init__ (
+		this,
+		include_directories: list[Path] = [],
+		cache_directory: Path | None = None
+	):
+		this.include_directories = list(include_directories)
+		this.cache = None
+		this.lock = threading.Lock()
+		this.parsed_files = dict()
+		# Which module each thread waits for, to detect cycles between threads.
+		this.waiting_threads = dict()
+		this.module_digests = dict()
+		this.module_index = dict()
+		this.ambiguous_modules = dict()
+		this.module_files = dict()
+		this.module_requires = dict()
+
+		if (cache_directory is not None):
+			this.cache = ParseCache(cache_directory)
+
+		this.build_module_index()
+
+	def get_include_directories (this) -> list[Path]:
+		return this.include_directories
+
+	def get_module_key (filename: str) -> str:
+		# Files of different include directories may share the same name.
+		return os.path.realpath(filename)
+
+	def get_module_digest (this, module_name: str) -> str | None:
+		return this.module_digests.get(module_name)
+
+	def set_module_digest (this, module_name: str, digest: str):
+		this.module_digests[module_name] = digest
+
+	def build_module_index (this) -> bool:
+		# Earlier include directories take precedence over later ones. Returns
+		# whether the index changed, as watch mode builds it on every check.
+		candidates = dict()
+		relative_names = list()
+		module_index = dict()
+
+		for dir in this.include_directories:
+			for path in sorted(Path(dir).rglob("*.dgl")):
+				candidates.setdefault(path.stem, list()).append(path)
+				relative_names.append(
+					(path.relative_to(dir).with_suffix("").as_posix(), path)
+				)
+
+		for (module_name, paths) in candidates.items():
+			module_index.setdefault(module_name, paths[0])
+
+			if (
+				(len(paths) > 1)
+				and (this.ambiguous_modules.get(module_name) != paths)
+			):
+				this.ambiguous_modules[module_name] = paths
+				Log.print_warning(
+					"Module name \""
+					+ module_name
+					+ "\" is ambiguous, using "
+					+ str(paths[0])
+					+ " instead of "
+					+ ", ".join(str(p) for p in paths[1:])
+					+ "."
+				)
+
+		# Requires may also name a file by its path within an include directory.
+		for (relative_name, path) in relative_names:
+			module_index.setdefault(relative_name, path)
+
+		has_changed = (module_index != this.module_index)
+		this.module_index = module_index
+
+		return has_changed
+
+	def find_required_file (this, module_name: str) -> Path | None:
+		candidate = this.module_index.get(module_name)
+
+		if (candidate is not None):
+			return candidate
+
+		candidate = Path(module_name + ".dgl")
+
+		if (candidate.is_file()):
+			return candidate
+
+		return None
+
+	def is_waiting_for (this, owner: int, thread: int) -> bool:
+		# Whether "owner" waits, even indirectly, for a module "thread" parses.
+		visited = set()
+
+		while ((owner not in visited) and (owner in this.waiting_threads)):
+			if (owner == thread):
+				return True
+
+			visited.add(owner)
+			owner = this.parsed_files[this.waiting_threads[owner]][1]
+
+		return (owner == thread)
+
+	def parse_file (this, filename: str):
+		module_name = ParseSession.get_module_key(filename)
+		thread = threading.get_ident()
+		done = None
+
+		with this.lock:
+			entry = this.parsed_files.get(module_name)
+
+			if (entry is None):
+				this.parsed_files[module_name] = (threading.Event(), thread)
+			elif (
+				(entry[1] != thread)
+				and not entry[0].is_set()
+				and not this.is_waiting_for(entry[1], thread)
+			):
+				# Another thread is parsing it, its types are needed from here.
+				# Within a cycle, it is skipped as when parsing in one thread.
+				done = entry[0]
+				this.waiting_threads[thread] = module_name
+
+		if (entry is not None):
+			Log.print_debug("File " + filename + " already parsed, skipping it.")
+
+			if (done is not None):
+				done.wait()
+
+				with this.lock:
+					del this.waiting_threads[thread]
+
+			return
+
+		try:
+			with Profiler.phase(
+				"module",
+				Path(filename).stem,
+				{"file": filename}
+			):
+				this.parse_module(module_name, filename)
+		finally:
+			this.parsed_files[module_name][0].set()
+
+	def record_module (this, module_name: str, filename: str, requires: list[str]):
+		this.module_files[module_name] = filename
+		this.module_requires[module_name] = list(requires)
+
+	def get_module_files (this) -> dict[str, str]:
+		return this.module_files
+
+	def get_requirers (this, module_names: set[str]) -> set[str]:
+		# Includes the given modules and everything that requires them, even
+		# indirectly.
+		requirers = dict()
+
+		for (module_name, requires) in this.module_requires.items():
+			for filename in requires:
+				requirers.setdefault(
+					ParseSession.get_module_key(filename),
+					set()
+				).add(module_name)
+
+		result = set(module_names)
+		pending = list(module_names)
+
+		while (len(pending) > 0):
+			for module_name in requirers.get(pending.pop(), set()):
+				if (module_name not in result):
+					result.add(module_name)
+					pending.append(module_name)
+
+		return result
+
+	def forget_module (this, module_name: str):
+		filename = this.module_files.get(module_name)
+		forgotten = set()
+
+		for t in list(UserDefinedType.get_all()):
+			if (t.get_token().get_filename() == filename):
+				t.unregister()
+				forgotten.add(t)
+
+		DefinedType.forget_interned(forgotten)
+		Backend.clear_caches()
+
+		this.parsed_files.pop(module_name, None)
+		this.module_digests.pop(module_name, None)
+
+	def mark_as_parsed (this, module_name: str):
+		done = threading.Event()
+		done.set()
+
+		with this.lock:
+			this.parsed_files[module_name] = (done, threading.get_ident())
+
+	def scan_requires (this, filename: str) -> list[str]:
+		# Only looks for requirements, the file is fully parsed later on.
+		with open(filename, 'r') as file:
+			content = ParseSession.COMMENT_REGEX.sub("", file.read())
+
+		result = list()
+
+		for name in ParseSession.REQUIRE_REGEX.findall(content):
+			candidate = this.find_required_file(name)
+
+			# Missing files get reported by the parser.
+			if (candidate is not None):
+				result.append(str(candidate))
+
+		return result
+
+	def build_module_graph (this, filename: str) -> list[list[str]] | None:
+		# Returns files grouped in waves that only require earlier waves.
+		requires = dict()
+		levels = dict()
+		order = list()
+		stack = [(filename, None)]
+
+		while (len(stack) > 0):
+			(current, pending) = stack.pop()
+
+			if (pending is None):
+				if (current in levels):
+					continue
+
+				if (current in requires):
+					# Cycles are left to the sequential parser.
+					return None
+
+				if (ParseSession.get_module_key(current) in this.parsed_files):
+					levels[current] = -1
+
+					continue
+
+				requires[current] = this.scan_requires(current)
+				pending = list(reversed(requires[current]))
+
+			if (len(pending) > 0):
+				stack.append((current, pending))
+				stack.append((pending.pop(), None))
+
+				continue
+
+			levels[current] = 1 + max(
+				[-1] + [levels[r] for r in requires[current]]
+			)
+			order.append(current)
+
+		result = [list() for i in range(0, max([-1] + list(levels.values())) + 1)]
+
+		for current in order:
+			result[levels[current]].append(current)
+
+		return result
+
+	def parse_in_worker (index: int) -> (
+		bytes | None,
+		str | None,
+		list,
+		list,
+		(list, dict),
+		list,
+		int,
+		int
+	):
+		(session, filenames) = ParseSession.PENDING_MODULES
+		filename = filenames[index]
+		errors = Log.ERRORS
+		warnings = Log.WARNINGS
+		fixes = len(TypoFixer.FIXES)
+		diagnostics = len(Log.DIAGNOSTICS)
+		profile = Profiler.snapshot()
+		result = None
+
+		# No terminal is attached to the workers.
+		TypoFixer.INTERACTIVE = False
+
+		try:
+			session.parse_file(filename)
+			result = ModulePickler.dump_module(filename)
+		except Exception:
+			result = None
+
+		if ((result is None) and ParseSession.KEEP_GOING):
+			# The types that could be parsed are still needed by its requirers.
+			result = ModulePickler.dump_module(filename)
+
+		Log.flush()
+
+		return (
+			result,
+			session.get_module_digest(ParseSession.get_module_key(filename)),
+			session.module_requires.get(
+				ParseSession.get_module_key(filename),
+				list()
+			),
+			TypoFixer.FIXES[fixes:],
+			Profiler.get_changes(profile),
+			Log.DIAGNOSTICS[diagnostics:],
+			Log.ERRORS - errors,
+			Log.WARNINGS - warnings
+		)
+
+	def check_errors (this, errors: int):
+		# In keep-going mode, errors are reported without stopping the parsing.
+		if (ParseSession.KEEP_GOING and (Log.ERRORS > errors)):
+			raise Exception(
+				str(Log.ERRORS - errors) + " error(s) found while parsing."
+			)
+
+	def parse_module_graph (this, filename: str, jobs: int):
+		waves = None
+		errors = Log.ERRORS
+
+		if ((jobs > 1) and ("fork" in multiprocessing.get_all_start_methods())):
+			waves = this.build_module_graph(filename)
+
+		if (waves is None):
+			this.parse_file(filename)
+			this.check_errors(errors)
+
+			return
+
+		context = multiprocessing.get_context("fork")
+		has_failed = False
+
+		for wave in waves:
+			if (len(wave) == 1):
+				this.parse_file(wave[0])
+
+				continue
+
+			# Workers are forked after each wave, inheriting its types.
+			ParseSession.PENDING_MODULES = (this, wave)
+			Log.flush()
+
+			try:
+				with context.Pool(min(jobs, len(wave))) as pool:
+					results = pool.imap(
+						ParseSession.parse_in_worker,
+						range(len(wave))
+					)
+
+					for (current, result) in zip(wave, results):
+						(
+							types,
+							digest,
+							requires,
+							fixes,
+							profile,
+							diagnostics,
+							worker_errors,
+							worker_warnings
+						) = result
+						Log.ERRORS += worker_errors
+						Log.WARNINGS += worker_warnings
+						Log.DIAGNOSTICS.extend(diagnostics)
+						TypoFixer.FIXES.extend(fixes)
+						Profiler.merge_changes(profile)
+						module_name = ParseSession.get_module_key(current)
+
+						this.record_module(module_name, current, requires)
+
+						if (types is None):
+							has_failed = True
+
+							continue
+
+						for t in ModuleUnpickler.load_module(types):
+							t.register()
+
+						if (digest is not None):
+							this.set_module_digest(module_name, digest)
+
+						this.mark_as_parsed(module_name)
+			finally:
+				ParseSession.PENDING_MODULES = (None, list())
+
+			if (has_failed and not ParseSession.KEEP_GOING):
+				raise Exception("Unable to parse all required modules.")
+
+		this.check_errors(errors)
+
+		if (has_failed):
+			raise Exception("Unable to parse all required modules.")
+
+	def split_forms (tokens):
+		form = list()
+
+		for t in tokens:
+			if ((t.type in ParseSession.TOP_LEVEL_TOKENS) and (len(form) > 0)):
+				yield form
+				form = list()
+
+			form.append(t)
+
+		if (len(form) > 0):
+			yield form
+
+	def report_exception (context: ParseContext, e: Exception):
+		# A bare "raise Exception" follows an error that was already reported.
+		if (
+			((type(e) is Exception) and (len(e.args) == 0))
+			or (context.last_token is None)
+		):
+			return
+
+		message = str(e)
+
+		if (message == ""):
+			message = repr(e)
+
+		context.print_error(message, context.last_token, "unexpected-error")
+
+	def parse_forms (this, parser, context: ParseContext, tokens):
+		# Each top-level form is parsed on its own, so that one failing does
+		# not prevent the others from being checked.
+		for form in ParseSession.split_forms(tokens):
+			context.last_token = None
+
+			try:
+				parser.parse(iter(form))
+			except Exception as e:
+				ParseSession.report_exception(context, e)
+
+	def parse_module (this, module_name: str, filename: str):
+		with open(filename, 'r') as file:
+			content = file.read()
+			file.close()
+
+		cache_key = None
+
+		if (this.cache is not None):
+			cache_key = this.cache.compute_key(this, filename, content)
+
+			with Profiler.phase("cache load", Path(filename).stem):
+				is_cached = this.cache.load(this, module_name, filename, cache_key)
+
+			if (is_cached):
+				Log.print_debug("Loaded " + filename + " from cache.")
+
+				return
+
+		Log.print_debug("Parsing " + filename + "...")
+
+		context = ParseContext(this, SourceFile(filename, content))
+		lexer = DragomanLexer()
+		lexer.context = context
+		parser = DragomanParser()
+		parser.context = context
+		reported_issues = Log.ERRORS + Log.WARNINGS
+
+		tokens = lexer.tokenize(content)
+
+		if (Profiler.ENABLED):
+			tokens = Profiler.time_iterator(tokens, "lexing")
+
+		if (TypoFixer.MODE == "report"):
+			tokens = context.track_forms(tokens)
+
+		try:
+			if (ParseSession.KEEP_GOING):
+				this.parse_forms(parser, context, tokens)
+			else:
+				parser.parse(tokens)
+		except Exception as e:
+			ParseSession.report_exception(context, e)
+			# Diagnostics come before the traceback, if it gets printed.
+			Log.flush()
+
+			raise e
+		finally:
+			this.record_module(module_name, filename, context.get_requires())
+			TypoFixer.apply_fixes(context)
+
+		if (cache_key is not None):
+			# Modules with diagnostics are parsed again so these get reported.
+			# This includes those that got fixed, their content having changed.
+			if (
+				(reported_issues == (Log.ERRORS + Log.WARNINGS))
+				and (len(context.get_fixes()) == 0)
+			):
+				with Profiler.phase("cache store", Path(filename).stem):
+					this.cache.store(
+						this,
+						module_name,
+						filename,
+						cache_key,
+						context.get_requires()
+					)
+
+		Log.print_debug("Loaded " + filename + ".")
+
+################################################################################
+#### PARSE CACHE ###############################################################
+################################################################################
+class ModulePickler (pickle.Pickler):
+	def __init__ (this, file, filename: str):
+		pickle.Pickler.__init__(this, file)
+		this.filename = filename
+
+	def persistent_id (this, obj):
+		# Types from other modules are referenced by name, not copied.
+		if (isinstance(obj, UserDefinedType)):
+			if (obj.get_token().get_filename() != this.filename):
+				return ("type", obj.get_name())
+		elif (isinstance(obj, EnumTypeEntry)):
+			parent = obj.get_parent()
+
+			if (parent.get_token().get_filename() != this.filename):
+				return ("enum_entry", parent.get_name(), obj.get_name())
+		elif (type(obj) is DefinedType):
+			return ("type", obj.get_name())
+
+		return None
+
+	def dump_module (filename: str) -> bytes:
+		defined_types = [
+			t for t in UserDefinedType.get_all()
+			if (t.get_token().get_filename() == filename)
+		]
+
+		buffer = io.BytesIO()
+		ModulePickler(buffer, filename).dump(defined_types)
+
+		return buffer.getvalue()
+
+class ModuleUnpickler (pickle.Unpickler):
+	def persistent_load (this, pid):
+		if (pid[0] == "type"):
+			return DefinedType.get(pid[1])
+		elif (pid[0] == "enum_entry"):
+			return EnumType.get(pid[1]).get_entry_from_name(pid[2])
+
+		raise pickle.UnpicklingError("Unknown reference " + str(pid) + ".")
+
+	def load_module (data: bytes) -> list:
+		return ModuleUnpickler(io.BytesIO(data)).load()
+
+class ParseCache:
+	SIGNATURE = None
+
+	def get_signature () -> str:
+		if (ParseCache.SIGNATURE is None):
+			hasher = hashlib.sha256()
+			hasher.update(Path(__file__).read_bytes())
+			hasher.update(sys.version.encode())
+			ParseCache.SIGNATURE = hasher.hexdigest()
+
+		return ParseCache.SIGNATURE
+
+	def __init__ (this, directory: Path):
+		this.directory = Path(directory)
+
+	def compute_key (this, session, filename: str, content: str) -> str:
+		hasher = hashlib.sha256()
+		hasher.update(ParseCache.get_signature().encode())
+		hasher.update(filename.encode())
+
+		for dir in sorted(str(d) for d in session.get_include_directories()):
+			hasher.update(dir.encode())
+
+		hasher.update(content.encode())
+
+		return hasher.hexdigest()
+
+	def compute_digest (session, cache_key: str, requires: list[str]) -> str:
+		# A module's digest covers its own content and that of its requirements.
+		hasher = hashlib.sha256()
+		hasher.update(cache_key.encode())
+
+		for filename in requires:
+			digest = session.get_module_digest(
+				ParseSession.get_module_key(filename)
+			)
+
+			if (digest is not None):
+				hasher.update(digest.encode())
+
+		return hasher.hexdigest()
+
+	def get_entry_path (this, cache_key: str) -> Path:
+		return this.directory / (cache_key + ".pickle")
+
+	def load (
+		this,
+		session,
+		module_name: str,
+		filename: str,
+		cache_key: str
+	) -> bool:
+		entry_path = this.get_entry_path(cache_key)
+
+		try:
+			with open(entry_path, 'rb') as file:
+				(requires, digests, types) = pickle.load(file)
+		except Exception:
+			return False
+
+		session.record_module(module_name, filename, requires)
+
+		for (required_file, digest) in zip(requires, digests):
+			session.parse_file(required_file)
+
+			required_digest = session.get_module_digest(
+				ParseSession.get_module_key(required_file)
+			)
+
+			if (required_digest != digest):
+				return False
+
+		try:
+			defined_types = ModuleUnpickler.load_module(types)
+		except Exception:
+			return False
+
+		for t in defined_types:
+			t.register()
+
+		session.set_module_digest(
+			module_name,
+			ParseCache.compute_digest(session, cache_key, requires)
+		)
+
+		return True
+
+	def store (
+		this,
+		session,
+		module_name: str,
+		filename: str,
+		cache_key: str,
+		requires: list[str]
+	):
+		session.set_module_digest(
+			module_name,
+			ParseCache.compute_digest(session, cache_key, requires)
+		)
+
+		types = ModulePickler.dump_module(filename)
+		digests = [
+			session.get_module_digest(ParseSession.get_module_key(r)) or ""
+			for r in requires
+		]
+
+		entry_path = this.get_entry_path(cache_key)
+		temp_path = entry_path.with_suffix(".tmp" + str(os.getpid()))
+
+		try:
+			entry_path.parent.mkdir(parents=True, exist_ok=True)
+
+			with open(temp_path, 'wb') as file:
+				pickle.dump((requires, digests, types), file)
+
+			os.replace(temp_path, entry_path)
+		except OSError as e:
+			Log.print_warning(
+				"Unable to write parse cache entry for "
+				+ filename
+				+ ": "
+				+ str(e)
+			)
+
+################################################################################
+#### SCHEMA IR #################################################################
+################################################################################
+class SchemaIR:
+	FORMAT = "dragoman-ir"
+	VERSION = 1
+
+	def describe_location (token: TokenLocation) -> list:
+		return [token.get_filename(), token.get_line(), token.get_column()]
+
+	def load_location (data: list) -> TokenLocation:
+		return TokenLocation(data[0], data[1], data[2])
+
+	def describe_type_reference (t: DefinedType):
+		if (isinstance(t, ArrayOfDefinedType)):
+			return ["array", SchemaIR.describe_type_reference(t.get_parent())]
+		elif (isinstance(t, SetOfDefinedType)):
+			return ["set", SchemaIR.describe_type_reference(t.get_parent())]
+		elif (isinstance(t, DictOfDefinedType)):
+			return [
+				"dict",
+				[
+					[n, SchemaIR.describe_type_reference(ft)]
+					for (n, ft) in t.get_accesses()
+				],
+				SchemaIR.describe_type_reference(t.get_key_type()),
+				SchemaIR.describe_type_reference(t.get_parent())
+			]
+
+		return t.get_name()
+
+	def load_type_reference (data) -> DefinedType:
+		if (isinstance(data, str)):
+			return DefinedType.get(data)
+		elif (data[0] == "array"):
+			return ArrayOfDefinedType.intern(
+				SchemaIR.load_type_reference(data[1])
+			)
+		elif (data[0] == "set"):
+			return SetOfDefinedType.intern(
+				SchemaIR.load_type_reference(data[1])
+			)
+		elif (data[0] == "dict"):
+			return DictOfDefinedType.intern(
+				[(n, SchemaIR.load_type_reference(ft)) for (n, ft) in data[1]],
+				SchemaIR.load_type_reference(data[2]),
+				SchemaIR.load_type_reference(data[3])
+			)
+
+		raise ValueError("Unknown type reference " + str(data) + ".")
+
+	def describe_type (t: UserDefinedType) -> dict:
+		result = {
+			"name": t.get_name(),
+			"location": SchemaIR.describe_location(t.get_token()),
+			"markers": sorted(t.markers)
+		}
+
+		if (isinstance(t, EnumType)):
+			result["kind"] = "enum"
+			result["type"] = SchemaIR.describe_type_reference(t.get_parent_type())
+			result["entries"] = [
+				{
+					"name": e.get_name(),
+					"tag": e.get_tag(),
+					"location": SchemaIR.describe_location(e.get_token())
+				}
+				for e in t.get_entries()
+			]
+		elif (isinstance(t, ObjectType)):
+			result["kind"] = "object"
+			result["entries"] = [
+				{
+					"name": e.get_name(),
+					"tag": e.get_tag(),
+					"type": SchemaIR.describe_type_reference(e.get_type()),
+					"const": e.maybe_get_const_value(),
+					"location": SchemaIR.describe_location(e.get_token())
+				}
+				for e in t.get_entries()
+			]
+		elif (isinstance(t, PolymorphType)):
+			result["kind"] = "polymorph"
+			result["enum"] = t.get_enum_type().get_name()
+			result["key_field"] = {
+				"name": t.get_key_field_name(),
+				"tag": t.get_key_field_tag()
+			}
+			result["shared_fields"] = [
+				{
+					"name": n,
+					"tag": t.get_shared_field_tag(n),
+					"type": SchemaIR.describe_type_reference(ft)
+				}
+				for (n, ft) in t.get_shared_fields().items()
+				if (n != t.get_key_field_name())
+			]
+			result["cases"] = [
+				{
+					"key": k,
+					"name": c.get_name(),
+					"type": SchemaIR.describe_type_reference(c.get_type()),
+					"enum_entry": c.get_enum_entry().get_name(),
+					"location": SchemaIR.describe_location(c.get_token())
+				}
+				for (k, c) in t.get_cases_as_dict().items()
+			]
+
+		return result
+
+	def load_type (data: dict) -> UserDefinedType:
+		location = SchemaIR.load_location(data["location"])
+
+		if (data["kind"] == "enum"):
+			result = EnumType(
+				location,
+				data["name"],
+				SchemaIR.load_type_reference(data["type"]),
+				[
+					EnumTypeEntry(
+						SchemaIR.load_location(e["location"]),
+						e["name"],
+						e["tag"]
+					)
+					for e in data["entries"]
+				]
+			)
+		elif (data["kind"] == "object"):
+			result = ObjectType(
+				location,
+				data["name"],
+				[
+					ObjectTypeEntry(
+						SchemaIR.load_location(e["location"]),
+						e["name"],
+						e["tag"],
+						SchemaIR.load_type_reference(e["type"]),
+						e["const"]
+					)
+					for e in data["entries"]
+				]
+			)
+		elif (data["kind"] == "polymorph"):
+			enum_type = EnumType.get(data["enum"])
+			cases = dict()
+
+			for c in data["cases"]:
+				pcase = PolymorphTypeCase(
+					SchemaIR.load_location(c["location"]),
+					c["name"],
+					SchemaIR.load_type_reference(c["type"])
+				)
+				pcase.set_enum_entry(enum_type.get_entry_from_name(c["enum_entry"]))
+				cases[c["key"]] = pcase
+
+			result = PolymorphType(
+				location,
+				data["name"],
+				data["key_field"]["name"],
+				data["key_field"]["tag"],
+				enum_type,
+				cases
+			)
+
+			for f in data["shared_fields"]:
+				result.add_shared_field(
+					f["name"],
+					SchemaIR.load_type_reference(f["type"]),
+					f["tag"]
+				)
+		else:
+			raise ValueError("Unknown kind of type \"" + data["kind"] + "\".")
+
+		for m in data["markers"]:
+			result.add_marker(m)
+
+		return result
+
+	def write (path: Path):
+		path = Path(path)
+		temp_path = path.with_name("." + path.name + ".tmp" + str(os.getpid()))
+
+		# Types are listed in definition order, so each only refers to earlier ones.
+		data = {
+			"format": SchemaIR.FORMAT,
+			"version": SchemaIR.VERSION,
+			"types": [SchemaIR.describe_type(t) for t in UserDefinedType.get_all()]
+		}
+
+		path.parent.mkdir(parents=True, exist_ok=True)
+
+		with open(temp_path, 'w') as file:
+			json.dump(data, file, separators=(",", ":"))
+
+		os.replace(temp_path, path)
+
+	def load (path: Path):
+		with open(path, 'r') as file:
+			data = json.load(file)
+
+		if (
+			(data.get("format") != SchemaIR.FORMAT)
+			or (data.get("version") != SchemaIR.VERSION)
+		):
+			Log.print_error(
+				str(path)
+				+ " is not a version "
+				+ str(SchemaIR.VERSION)
+				+ " Dragoman IR file."
+			)
+
+			raise Exception
+
+		for t in data["types"]:
+			SchemaIR.load_type(t).register()
+
+################################################################################
+#### BACKEND PLUGINS ###########################################################
+################################################################################
+class Backend (abc.ABC):
+	# Code generators inherit from this, overriding what they need and at
+	# least the abstract functions. Only the module of a backend that gets
+	# used is imported.
+	NAME = None
+	DEFAULT_INDENT = "\t"
+	# Backends shipped with Dragoman, as (script, class name).
+	BUILTINS = {
+		"erlang-jiffy": ("dragoman-erlang-jiffy.py", "Dragoman2Erlang"),
+		"gren": ("dragoman-gren.py", "Dragoman2Gren"),
+	}
+	# Other packages can provide backends through this entry point group.
+	ENTRY_POINT_GROUP = "dragoman.backends"
+	LOADERS = dict()
+	LOADED = dict()
+
+	def get_session_state () -> list:
+		# Class attributes to reset between compilations, see Session.
+		return list()
+
+	def get_caches () -> list:
+		# Class attributes holding dicts keyed by types or parts of them, as
+		# (class, attribute name). These get cleared when types are forgotten.
+		return list()
+
+	def clear_caches ():
+		for backend in Backend.LOADED.values():
+			for (owner, name) in backend.get_caches():
+				getattr(owner, name).clear()
+
+	def add_arguments (argparser):
+		return
+
+	def handle_arguments (args):
+		return
+
+	@abc.abstractmethod
+	def get_filename (t: UserDefinedType) -> str:
+		raise NotImplementedError
+
+	@abc.abstractmethod
+	def export ():
+		raise NotImplementedError
+
+	def check (name: str, backend):
+		# Backends are never instantiated, which is when abc would check them.
+		if (not (isinstance(backend, type) and issubclass(backend, Backend))):
+			raise TypeError(
+				"Backend \"" + name + "\" does not inherit from dragoman.Backend."
+			)
+
+		if (len(backend.__abstractmethods__) > 0):
+			raise TypeError(
+				"Backend \""
+				+ name
+				+ "\" does not define "
+				+ ", ".join(sorted(backend.__abstractmethods__))
+				+ "."
+			)
+
+	def register (name: str, loader):
+		# "loader" returns the backend class, and is only called on first use.
+		Backend.LOADERS[name] = loader
+
+	def load_builtin (name: str):
+		(filename, class_name) = Backend.BUILTINS[name]
+		module_name = "dragoman_" + name.replace("-", "_")
+		module = sys.modules.get(module_name)
+
+		if (module is None):
+			spec = importlib.util.spec_from_file_location(
+				module_name,
+				Path(__file__).resolve().parent / filename
+			)
+			module = importlib.util.module_from_spec(spec)
+			sys.modules[module_name] = module
+			spec.loader.exec_module(module)
+
+		return getattr(module, class_name)
+
+	def discover ():
+		# Reading the entry points is slow enough to only be done when needed.
+		import importlib.metadata
+
+		for entry_point in importlib.metadata.entry_points(
+			group=Backend.ENTRY_POINT_GROUP
+		):
+			if (
+				(entry_point.name not in Backend.LOADERS)
+				and (entry_point.name not in Backend.BUILTINS)
+			):
+				Backend.register(entry_point.name, entry_point.load)
+
+	def get_names () -> list[str]:
+		Backend.discover()
+
+		return sorted(set(Backend.BUILTINS) | set(Backend.LOADERS))
+
+	def get (name: str):
+		result = Backend.LOADED.get(name)
+
+		if (result is not None):
+			return result
+
+		if ((name not in Backend.LOADERS) and (name not in Backend.BUILTINS)):
+			Backend.discover()
+
+		if (name in Backend.LOADERS):
+			result = Backend.LOADERS[name]()
+		elif (name in Backend.BUILTINS):
+			result = Backend.load_builtin(name)
+		else:
+			return None
+
+		Backend.check(name, result)
+		Backend.LOADED[name] = result
+
+		return result
+
+	def main (backend):
+		# Runs a backend on its own, from its script.
+		Backend.check(backend.NAME, backend)
+		Backend.LOADED[backend.NAME] = backend
+		CodeWriter.DEFAULT_INDENT = backend.DEFAULT_INDENT
+
+		argparser = Dragoman.initialize()
+		backend.add_arguments(argparser)
+		args = argparser.parse_args()
+
+		backend.handle_arguments(args)
+		Dragoman.handle_arguments(args)
+		Dragoman.load_schema(argparser, args)
+
+		if (args.affected_by is not None):
+			target = (
+				backend.NAME,
+				backend,
+				Path(Dragoman.OUTPUT_FOLDER),
+				CodeWriter.DEFAULT_INDENT
+			)
+
+			if (not Dragoman.print_affected(args.affected_by, [target])):
+				sys.exit(1)
+
+			return
+
+		backend.export()
+		Profiler.finalize()
+		Dragoman.watch(backend.export)
+
+class Dragoman:
+	OUTPUT_FOLDER = "."
+	PARSE_SESSION = ParseSession()
+	JOBS = 1
+	PENDING_CONVERSIONS = list()
+	IR_OUTPUT = None
+	CHECK = False
+	DIAGNOSTICS_FILE = None
+	WATCH = False
+	WATCH_INTERVAL = 0.5
+
+	def register_base_types ():
+		t0 = DefinedType("string")
+		t0.register()
+
+		t0 = DefinedType("integer")
+		t0.register()
+
+		t0 = DefinedType("boolean")
+		t0.register()
+
+		t0 = DefinedType("float")
+		t0.register()
+
+	def initialize ():
+		Dragoman.register_base_types()
+
+		argparser = argparse.ArgumentParser()
+		argparser.add_argument(
+			"dgl_file",
+			type=Path,
+			nargs='?',
+			help="DGL description entry point."
+		)
+		argparser.add_argument(
+			"--roles",
+			type=str,
+			nargs='*',
+			help="Roles for this target."
+		)
+		argparser.add_argument(
+			"--output-folder",
+			type=Path,
+			nargs=1,
+			help="Where to output files"
+		)
+		argparser.add_argument(
+			"--include",
+			type=Path,
+			nargs='*',
+			help="Where to look for files"
+		)
+		argparser.add_argument(
+			"--indentation",
+			type=str,
+			nargs=1,
+			help="What to use as indentation"
+		)
+		argparser.add_argument(
+			"--jobs",
+			type=int,
+			nargs=1,
+			help="How many processes to use to generate files"
+		)
+		argparser.add_argument(
+			"--force",
+			action="store_true",
+			default=False,
+			help="Regenerate all files, even those that are up to date"
+		)
+		argparser.add_argument(
+			"-q",
+			"--quiet",
+			action="store_true",
+			default=False,
+			help="Only print errors"
+		)
+		argparser.add_argument(
+			"-v",
+			"--verbose",
+			action="store_true",
+			default=False,
+			help="Also print debug messages, such as each module being parsed"
+		)
+		argparser.add_argument(
+			"--diagnostics-format",
+			choices=Log.FORMATS,
+			default="text",
+			help="How to print errors and warnings: as text or JSON lines"
+		)
+		argparser.add_argument(
+			"--check",
+			action="store_true",
+			default=False,
+			help=(
+				"Only check the schema for errors, implies --keep-going and"
+				+ " generates nothing"
+			)
+		)
+		argparser.add_argument(
+			"--diagnostics",
+			type=Path,
+			nargs=1,
+			help=(
+				"Where to write the errors and warnings found while loading the"
+				+ " schema, as JSON"
+			)
+		)
+		argparser.add_argument(
+			"--keep-going",
+			action="store_true",
+			default=False,
+			help=(
+				"Report every error in the schema instead of stopping at the"
+				+ " first one"
+			)
+		)
+		argparser.add_argument(
+			"--cache-dir",
+			type=Path,
+			nargs=1,
+			help="Where to keep parsed modules between runs"
+		)
+		argparser.add_argument(
+			"--ir",
+			type=Path,
+			nargs=1,
+			help="Schema IR file to use instead of a DGL entry point"
+		)
+		argparser.add_argument(
+			"--emit-ir",
+			type=Path,
+			nargs=1,
+			help="Where to write the schema IR"
+		)
+		argparser.add_argument(
+			"--fix",
+			type=str,
+			choices=TypoFixer.MODES,
+			default="interactive",
+			help=(
+				"How to handle unknown names: ask which candidate to use, use"
+				+ " the closest one and fix the file (auto), or only report it"
+				+ " (report, which fails if any is found)"
+			)
+		)
+		argparser.add_argument(
+			"--fix-report",
+			type=Path,
+			nargs=1,
+			help="Where to write the list of typo fixes, as JSON"
+		)
+		argparser.add_argument(
+			"--profile",
+			action="store_true",
+			default=False,
+			help="Print the time and memory taken by each compilation phase"
+		)
+		argparser.add_argument(
+			"--profile-trace",
+			type=Path,
+			nargs=1,
+			help="Where to write the profile as Chrome trace events (JSON)"
+		)
+		argparser.add_argument(
+			"--watch",
+			action="store_true",
+			default=False,
+			help="Keep running, rebuilding whenever DGL files change"
+		)
+		argparser.add_argument(
+			"--affected-by",
+			type=str,
+			action="append",
+			help=(
+				"List the types embedding this one, and the files generated for"
+				+ " them, instead of generating anything. Can be repeated."
+			)
+		)
+
+		return argparser
+
+	def handle_arguments (args):
+		if (args.quiet):
+			Log.LEVEL = 0
+		elif (args.verbose):
+			Log.LEVEL = 2
+
+		Log.FORMAT = args.diagnostics_format
+		atexit.register(Log.finalize)
+
+		if (args.output_folder is not None):
+			Dragoman.OUTPUT_FOLDER = args.output_folder[0]
+
+		if (args.indentation is not None):
+			CodeWriter.DEFAULT_INDENT = args.indentation[0]
+
+		if (args.jobs is not None):
+			Dragoman.JOBS = max(1, args.jobs[0])
+
+		if (args.force):
+			OutputManifest.FORCE = True
+
+		if (args.emit_ir is not None):
+			Dragoman.IR_OUTPUT = args.emit_ir[0]
+
+		Dragoman.WATCH = args.watch
+
+		if (args.profile_trace is not None):
+			Profiler.enable(args.profile_trace[0])
+		elif (args.profile):
+			Profiler.enable(None)
+
+		ParseSession.KEEP_GOING = args.keep_going or args.check
+		Dragoman.CHECK = args.check
+
+		if (args.diagnostics is not None):
+			Dragoman.DIAGNOSTICS_FILE = args.diagnostics[0]
+
+		# Checking never prompts nor rewrites files.
+		TypoFixer.MODE = "report" if (args.check) else args.fix
+
+		if (args.fix_report is not None):
+			TypoFixer.REPORT_FILE = args.fix_report[0]
+
+		cache_directory = None
+
+		if (args.cache_dir is not None):
+			cache_directory = args.cache_dir[0]
+
+		Dragoman.PARSE_SESSION = ParseSession(
+			args.include or [],
+			cache_directory
+		)
+
+	def load_schema (argparser, args):
+		has_failed = False
+
+		if (args.ir is not None):
+			if (args.dgl_file is not None):
+				argparser.error("dgl_file and --ir cannot be used together")
+
+			if (args.watch):
+				argparser.error("--watch requires dgl_file")
+
+			try:
+				SchemaIR.load(args.ir[0])
+			except Exception as e:
+				Log.flush()
+
+				raise e
+		elif (args.dgl_file is not None):
+			try:
+				Dragoman.PARSE_SESSION.parse_module_graph(
+					str(args.dgl_file),
+					Dragoman.JOBS
+				)
+			except Exception as e:
+				if (not ParseSession.KEEP_GOING):
+					Log.flush()
+
+					raise e
+
+				has_failed = True
+		else:
+			argparser.error("either dgl_file or --ir is required")
+
+		TypoFixer.write_report()
+
+		if (Dragoman.DIAGNOSTICS_FILE is not None):
+			Log.write_diagnostics(Dragoman.DIAGNOSTICS_FILE)
+
+		if ((TypoFixer.MODE == "report") and (len(TypoFixer.FIXES) > 0)):
+			Log.print_failure(
+				str(len(TypoFixer.FIXES))
+				+ " unknown name(s) found, see the errors above."
+			)
+			has_failed = True
+
+		has_failed = has_failed or (Log.ERRORS > 0)
+
+		if (Dragoman.CHECK):
+			sys.exit(1 if (has_failed) else 0)
+
+		if (has_failed):
+			Log.print_failure(
+				str(Log.ERRORS)
+				+ " error(s) found, no file was generated."
+			)
+			sys.exit(1)
+
+		if (Dragoman.IR_OUTPUT is not None):
+			SchemaIR.write(Dragoman.IR_OUTPUT)
+
+	def get_modification_times (session) -> dict[str, int | None]:
+		result = dict()
+
+		for (module_name, filename) in session.get_module_files().items():
+			try:
+				result[module_name] = os.stat(filename).st_mtime_ns
+			except OSError:
+				result[module_name] = None
+
+		return result
+
+	def rebuild (session, changed: set[str], modules: set[str], export):
+		# "modules" are those "changed" and their requirers.
+		module_files = dict(session.get_module_files())
+
+		for module_name in modules:
+			session.forget_module(module_name)
+
+		errors = Log.ERRORS
+
+		# Requirements that were forgotten get parsed again on their first use.
+		for module_name in sorted(modules):
+			session.parse_file(module_files[module_name])
+
+		session.check_errors(errors)
+
+		if (Dragoman.IR_OUTPUT is not None):
+			SchemaIR.write(Dragoman.IR_OUTPUT)
+
+		# Only the types of changed modules, and those embedding them, can
+		# have different output.
+		changed_files = set(
+			session.get_module_files().get(module_name)
+			for module_name in changed
+		)
+		changed_types = [
+			t
+			for t in UserDefinedType.get_all()
+			if (t.get_token().get_filename() in changed_files)
+		]
+
+		OutputManifest.AFFECTED_TYPES = set(
+			DependencyIndex(UserDefinedType.get_all()).get_affected(changed_types)
+		)
+
+		try:
+			export()
+		finally:
+			OutputManifest.AFFECTED_TYPES = None
+
+	def watch (export):
+		if (not Dragoman.WATCH):
+			return
+
+		session = Dragoman.PARSE_SESSION
+		modification_times = Dragoman.get_modification_times(session)
+		failed_modules = set()
+
+		Log.print(
+			"Watching "
+			+ str(len(modification_times))
+			+ " file(s) for changes."
+		)
+
+		try:
+			while True:
+				Log.flush()
+				time.sleep(Dragoman.WATCH_INTERVAL)
+
+				# Files added to the include directories can be required.
+				has_new_modules = session.build_module_index()
+				current = Dragoman.get_modification_times(session)
+				changed = set(
+					module_name
+					for (module_name, mtime) in current.items()
+					if (modification_times.get(module_name) != mtime)
+				)
+
+				if (
+					(len(changed) == 0)
+					and not (has_new_modules and (len(failed_modules) > 0))
+				):
+					continue
+
+				start = time.perf_counter()
+				changed |= failed_modules
+				modules = session.get_requirers(changed)
+
+				try:
+					Dragoman.rebuild(session, changed, modules, export)
+					failed_modules = set()
+					status = "Rebuilt "
+				except Exception:
+					# These are parsed again on the next change, fixed or not.
+					failed_modules = modules
+					status = "Failed to rebuild "
+
+				Log.print(
+					status
+					+ str(len(modules))
+					+ " module(s) in "
+					+ "{:.1f}".format((time.perf_counter() - start) * 1000)
+					+ " ms."
+				)
+
+				# Files changed during the rebuild are caught on the next check.
+				modification_times = Dragoman.get_modification_times(session)
+				modification_times.update(current)
+		except KeyboardInterrupt:
+			return
+
+	def convert (converter, t):
+		with Profiler.phase(
+			"convert",
+			converter.__qualname__ + " " + t.get_name(),
+			{"module": t.get_token().get_filename()}
+		):
+			converter(t)
+
+	def run_conversion (index: int) -> (int, int, (list, dict)):
+		(converter, t) = Dragoman.PENDING_CONVERSIONS[index]
+		errors = Log.ERRORS
+		warnings = Log.WARNINGS
+		profile = Profiler.snapshot()
+
+		Dragoman.convert(converter, t)
+		Log.flush()
+
+		return (
+			Log.ERRORS - errors,
+			Log.WARNINGS - warnings,
+			Profiler.get_changes(profile)
+		)
+
+	def run_conversions (conversions: list):
+		if (
+			(Dragoman.JOBS > 1)
+			and (len(conversions) > 1)
+			and ("fork" not in multiprocessing.get_all_start_methods())
+		):
+			Log.print_warning(
+				"Parallel generation requires fork(), using a single process."
+			)
+			Dragoman.JOBS = 1
+
+		if ((Dragoman.JOBS <= 1) or (len(conversions) <= 1)):
+			for (converter, t) in conversions:
+				Dragoman.convert(converter, t)
+
+			return
+
+		# Workers inherit the parsed types when forked, only indices are sent.
+		Dragoman.PENDING_CONVERSIONS = conversions
+		context = multiprocessing.get_context("fork")
+		chunk_size = max(1, len(conversions) // (Dragoman.JOBS * 4))
+		Log.flush()
+
+		try:
+			with context.Pool(Dragoman.JOBS) as pool:
+				for (errors, warnings, profile) in pool.imap_unordered(
+					Dragoman.run_conversion,
+					range(len(conversions)),
+					chunk_size
+				):
+					Log.ERRORS += errors
+					Log.WARNINGS += warnings
+					Profiler.merge_changes(profile)
+		finally:
+			Dragoman.PENDING_CONVERSIONS = list()
+
+	def run_target (target):
+		(name, backend, output_folder, indentation) = target
+
+		Log.print_debug("Generating " + name + " files in " + str(output_folder))
+
+		Dragoman.OUTPUT_FOLDER = output_folder
+		CodeWriter.DEFAULT_INDENT = indentation
+
+		with Profiler.phase("target", name):
+			backend.export()
+
+	def run_target_in_process (target, connection):
+		errors = Log.ERRORS
+		warnings = Log.WARNINGS
+		profile = Profiler.snapshot()
+
+		try:
+			Dragoman.run_target(target)
+		finally:
+			Log.flush()
+			connection.send(
+				(
+					Log.ERRORS - errors,
+					Log.WARNINGS - warnings,
+					Profiler.get_changes(profile)
+				)
+			)
+			connection.close()
+
+	def run_targets (targets: list):
+		if (
+			(Dragoman.JOBS <= 1)
+			or (len(targets) <= 1)
+			or ("fork" not in multiprocessing.get_all_start_methods())
+		):
+			for target in targets:
+				Dragoman.run_target(target)
+
+			return
+
+		# Each target gets its own process, sharing the available jobs.
+		jobs = Dragoman.JOBS
+		Dragoman.JOBS = max(1, jobs // len(targets))
+		context = multiprocessing.get_context("fork")
+		processes = list()
+		Log.flush()
+
+		try:
+			for target in targets:
+				(receiver, sender) = context.Pipe(False)
+				process = context.Process(
+					target=Dragoman.run_target_in_process,
+					args=(target, sender)
+				)
+				process.start()
+				sender.close()
+				processes.append((target, process, receiver))
+
+			for (target, process, receiver) in processes:
+				try:
+					(errors, warnings, profile) = receiver.recv()
+					Log.ERRORS += errors
+					Log.WARNINGS += warnings
+					Profiler.merge_changes(profile)
+				except EOFError:
+					pass
+
+				process.join()
+
+				if (process.exitcode != 0):
+					Log.print_error("Target " + target[0] + " failed.")
+		finally:
+			Dragoman.JOBS = jobs
+
+	def print_affected (names: list[str], targets: list) -> bool:
+		# Returns whether all names were known.
+		types = list()
+
+		for name in names:
+			t = UserDefinedType.maybe_get(name.lower())
+
+			if (t is None):
+				candidates = TypoFixer.TYPE_NAMES.find_closest_to(
+					name.lower(),
+					0.25
+				)
+				message = "Unknown type \"" + name + "\"."
+
+				if (len(candidates) > 0):
+					message += " Closest candidates are: " + ", ".join(candidates)
+
+				Log.print_error(message)
+
+				continue
+
+			types.append(t)
+
+		if (len(types) == 0):
+			return False
+
+		affected = DependencyIndex(UserDefinedType.get_all()).get_affected(types)
+
+		Log.print_result("---- Affected Types:")
+
+		for t in affected:
+			Log.print_result(t.get_name())
+
+		for (name, backend, output_folder, indentation) in targets:
+			Log.print_result("\n---- Affected Files (" + name + "):")
+
+			for t in affected:
+				Log.print_result(str(output_folder / backend.get_filename(t)))
+
+		return (len(types) == len(names))
+
+	def main ():
+		argparser = Dragoman.initialize()
+		argparser.add_argument(
+			"--target",
+			type=str,
+			action="append",
+			help=(
+				"Backend to generate files with, and where to put them, as"
+				+ " NAME:DIR (DIR defaults to the output folder). Available"
+				+ " backends: "
+				+ ", ".join(Backend.BUILTINS)
+				+ ", and those of installed plugins."
+			)
+		)
+
+		# Backends add their own options, so these need to be known first.
+		target_parser = argparse.ArgumentParser(add_help=False)
+		target_parser.add_argument("--target", type=str, action="append")
+		(target_args, others) = target_parser.parse_known_args()
+
+		targets = list()
+
+		for target in (target_args.target or list()):
+			(name, separator, output_folder) = target.partition(":")
+			backend = Backend.get(name)
+
+			if (backend is None):
+				argparser.error(
+					"unknown backend \""
+					+ name
+					+ "\", available backends are: "
+					+ ", ".join(Backend.get_names())
+				)
+
+			if (backend not in [t[1] for t in targets]):
+				backend.add_arguments(argparser)
+
+			targets.append((name, backend, output_folder))
+
+		args = argparser.parse_args()
+
+		if (
+			(len(targets) == 0)
+			and (args.emit_ir is None)
+			and (args.affected_by is None)
+			and (not args.check)
+		):
+			argparser.error(
+				"at least one --target, --emit-ir, --affected-by or --check is"
+				+ " required"
+			)
+
+		Dragoman.handle_arguments(args)
+
+		for (name, backend, output_folder) in targets:
+			backend.handle_arguments(args)
+
+		Dragoman.load_schema(argparser, args)
+
+		targets = [
+			(
+				name,
+				backend,
+				Path(output_folder or Dragoman.OUTPUT_FOLDER),
+				(
+					args.indentation[0]
+					if (args.indentation is not None)
+					else backend.DEFAULT_INDENT
+				)
+			)
+			for (name, backend, output_folder) in targets
+		]
+
+		if (args.affected_by is not None):
+			if (not Dragoman.print_affected(args.affected_by, targets)):
+				sys.exit(1)
+
+			return
+
+		Dragoman.run_targets(targets)
+		Profiler.finalize()
+		Dragoman.watch(lambda: Dragoman.run_targets(targets))
+
+	def print ():
+		print("---- Enum Types:")
+		for e in EnumType.get_all():
+			print(e.to_string())
+
+		print("\n---- Object Types:")
+		for e in ObjectType.get_all():
+			print(e.to_string())
+
+		print("\n---- Polymorph Types:")
+		for e in PolymorphType.get_all():
+			print(e.to_string())
+
+################################################################################
+#### COMPILATION SESSION #######################################################
+################################################################################
+class Session:
+	# Class attributes holding compilation state, with what a new session
+	# starts with. Backends add their own through get_session_state().
+	# TokenLocation's filename table is shared, as locations outlive sessions.
+	STATE = [
+		(Log, "ERRORS", lambda: 0),
+		(Log, "WARNINGS", lambda: 0),
+		(Log, "DIAGNOSTICS", list),
+		(DefinedType, "COLLECTION", dict),
+		(UserDefinedType, "COLLECTION", dict),
+		(ObjectType, "COLLECTION", dict),
+		(EnumType, "COLLECTION", dict),
+		(PolymorphType, "COLLECTION", dict),
+		(ArrayOfDefinedType, "INTERNED", dict),
+		(SetOfDefinedType, "INTERNED", dict),
+		(DictOfDefinedType, "INTERNED", dict),
+		(TypoFixer, "ACCEPTED_FIXES", dict),
+		(TypoFixer, "TYPE_NAMES", TypoIndex),
+		(TypoFixer, "FIXES", list),
+		(TypoFixer, "MODE", lambda: "interactive"),
+		(TypoFixer, "REPORT_FILE", lambda: None),
+		(TypoFixer, "INTERACTIVE", lambda: False),
+		(ParseSession, "KEEP_GOING", lambda: False),
+		(CodeWriter, "DEFAULT_INDENT", lambda: "\t"),
+		(OutputManifest, "FORCE", lambda: False),
+		(Dragoman, "OUTPUT_FOLDER", lambda: "."),
+		(Dragoman, "JOBS", lambda: 1),
+		(Dragoman, "PARSE_SESSION", ParseSession),
+		(Dragoman, "PENDING_CONVERSIONS", list),
+		(Dragoman, "IR_OUTPUT", lambda: None),
+		(Dragoman, "WATCH", lambda: False),
+	]
+
+	def add_state (state: list):
+		known = set((owner, attribute) for (owner, attribute, f) in Session.STATE)
+
+		for (owner, attribute, factory) in state:
+			if ((owner, attribute) not in known):
+				Session.STATE.append((owner, attribute, factory))
+
+	def __init__ (
+		this,
+		include_directories: list[Path] = [],
+		output_folder: Path = Path("."),
+		jobs: int = 1,
+		cache_directory: Path | None = None,
+		indentation: str | None = None,
+		force: bool = False,
+		options: dict = dict(),
+		keep_going: bool = False
+	):
+		this.include_directories = [Path(d) for d in include_directories]
+		this.output_folder = Path(output_folder)
+		this.jobs = max(1, jobs)
+		this.cache_directory = cache_directory
+		this.indentation = indentation
+		this.force = force
+		this.keep_going = keep_going
+		this.options = dict(options)
+		this.values = dict()
+		this.previous_values = list()
+
+	def reset (this):
+		this.values = dict()
+
+		with this:
+			Dragoman.JOBS = this.jobs
+			Dragoman.OUTPUT_FOLDER = this.output_folder
+			Dragoman.PARSE_SESSION = ParseSession(
+				this.include_directories,
+				this.cache_directory
+			)
+			OutputManifest.FORCE = this.force
+			ParseSession.KEEP_GOING = this.keep_going
+			Dragoman.register_base_types()
+
+	def __enter__ (this):
+		previous = dict()
+
+		for (owner, attribute, factory) in Session.STATE:
+			key = (owner, attribute)
+			previous[key] = getattr(owner, attribute)
+
+			if (key not in this.values):
+				this.values[key] = factory()
+
+			setattr(owner, attribute, this.values[key])
+
+		this.previous_values.append(previous)
+
+		return this
+
+	def __exit__ (this, exception_type, exception, traceback):
+		previous = this.previous_values.pop()
+
+		for ((owner, attribute), value) in previous.items():
+			this.values[(owner, attribute)] = getattr(owner, attribute)
+			setattr(owner, attribute, value)
+
+		return False
+
+	def get_target_arguments (this, backend):
+		# Backends take their options as parsed command line arguments.
+		argparser = argparse.ArgumentParser()
+		backend.add_arguments(argparser)
+		result = argparser.parse_args([])
+
+		for (name, value) in this.options.items():
+			setattr(result, name, value)
+
+		return result
+
+	def compile (this, entry_points: list[Path], targets: list[(str, Path)]) -> int:
+		# Returns the number of errors. Types remain available, from within a
+		# "with" block on this session, until the next compilation.
+		backends = list()
+
+		for (name, output_folder) in targets:
+			backend = Backend.get(name)
+
+			if (backend is None):
+				raise ValueError("Unknown backend \"" + name + "\".")
+
+			Session.add_state(backend.get_session_state())
+			backends.append(
+				(
+					name,
+					backend,
+					Path(output_folder),
+					this.indentation or backend.DEFAULT_INDENT
+				)
+			)
+
+		this.reset()
+
+		with this:
+			try:
+				errors = Log.ERRORS
+
+				for entry_point in entry_points:
+					Dragoman.PARSE_SESSION.parse_module_graph(
+						str(entry_point),
+						Dragoman.JOBS
+					)
+
+				for (name, backend, output_folder, indentation) in backends:
+					backend.handle_arguments(this.get_target_arguments(backend))
+
+				Dragoman.run_targets(backends)
+			except Exception as e:
+				# Otherwise, it was caused by the errors reported so far.
+				if (Log.ERRORS == errors):
+					Log.print_error("Compilation failed: " + (str(e) or repr(e)))
+			finally:
+				Log.flush()
+
+			return Log.ERRORS
+
+if __name__ == '__main__':
+	# Backends import this file as "dragoman", which needs to be this module.
+	sys.modules["dragoman"] = sys.modules[__name__]
 
-	Dragoman.print()
+	Dragoman.main()